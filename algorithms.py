@@ -1,203 +1,877 @@
 """
 Pathfinding algorithms for maze solving
+
+The algorithms are pure generators over the maze structure: they never touch
+pygame or the cells' display flags. Each one yields compact step events that a
+consumer (the visualizer, a batch job) can apply, draw or simply ignore.
 """
 
-import pygame
+from array import array
 from collections import deque
+from itertools import chain
 import heapq
-from constants import BACKGROUND
+import time
+from maze import FLAG_PATH, FLAG_SEARCHED
+from results import SolveResult
+
+
+# Step event kinds, yielded as (kind, row, col) tuples
+VISIT = 0      # node expanded by the search
+ENQUEUE = 1    # node added to the frontier
+PATH = 2       # node on the final path, emitted in order from start to end
+
+
+class SearchState:
+    """Per-cell working arrays of a search, allocated once and reused
+    
+    ``parent`` and ``cost`` of a cell only count when its ``reached`` stamp
+    equals the current epoch, and it is closed when its ``closed`` stamp
+    does. Starting a search bumps the epoch instead of clearing anything,
+    so it costs O(1) however large the maze is.
+    """
+    
+    # Largest epoch an 'I' array holds; the stamps are reset when it wraps
+    MAX_EPOCH = 2 ** 32 - 1
+    
+    def __init__(self, size):
+        self.size = size
+        self.parent = array('i', [-1]) * size
+        self.cost = array('i', [0]) * size
+        self.reached = array('I', [0]) * size
+        self.closed = array('I', [0]) * size
+        self.epoch = 0
+    
+    def begin(self):
+        """Start a new search, invalidating every cell at once; returns its epoch"""
+        if self.epoch == self.MAX_EPOCH:
+            self.reached[:] = array('I', [0]) * self.size
+            self.closed[:] = array('I', [0]) * self.size
+            self.epoch = 0
+        self.epoch += 1
+        return self.epoch
 
 
 class PathfindingAlgorithm:
-    """Base class for pathfinding algorithms"""
+    """Base class for pathfinding algorithms
+    
+    All algorithms on a maze reuse the SearchStates kept on it, so a maze
+    runs one search at a time: starting another abandons the previous one.
+    """
+    
+    # Key of the algorithm in ALGORITHMS and in exported results
+    name = ""
     
     def __init__(self, maze):
         self.maze = maze
     
-    def solve(self, screen, offset_x, offset_y, cell_size, delay=10):
-        """Solve the maze - to be implemented by subclasses"""
+    def _search_state(self, key="forward"):
+        """Get the maze's reusable working arrays, allocating them on first use
+        
+        Bidirectional searches use a second set under another key.
+        """
+        states = self.maze.search_states
+        state = states.get(key)
+        if state is None or state.size != self.maze.size:
+            state = states[key] = SearchState(self.maze.size)
+        return state
+    
+    def prepare(self, start=None, end=None):
+        """Build whatever maze index the search reads, ahead of steps()
+        
+        Indexes are otherwise built on the first step, which a caller
+        animating the search would see as one long frame. Most searches
+        need nothing.
+        """
+    
+    def steps(self, start=None, end=None, result=None):
+        """Yield step events while searching - to be implemented by subclasses
+        
+        The generator's return value is the path as a list of (row, col)
+        positions, or None when the end is unreachable. The search counters
+        and the path are kept up to date on ``result``, a SolveResult.
+        """
         raise NotImplementedError
     
-    def _reconstruct_path(self, end_cell, parent):
-        """Reconstruct the path from start to end"""
-        current = end_cell
-        while current:
-            current.is_path = True
-            current = parent[current]
+    def solve(self, start=None, end=None):
+        """Run the search to completion at full speed and return its SolveResult"""
+        result = SolveResult(self.name)
+        started = time.perf_counter_ns()
+        for _ in self.steps(start, end, result):
+            pass
+        result.compute_ns = time.perf_counter_ns() - started
+        return result
     
-    def _visualize(self, screen, offset_x, offset_y, cell_size):
-        """Update the screen to show current progress"""
-        screen.fill(BACKGROUND)
-        self.maze.draw(screen, offset_x, offset_y, cell_size)
-        pygame.display.flip()
+    def _reconstruct_path(self, end_index, parent):
+        """Reconstruct the path from start to end as (row, col) positions"""
+        path = []
+        current = end_index
+        while current != -1:
+            path.append(self.maze.position(current))
+            current = parent[current]
+        path.reverse()
+        return path
     
-    def _get_start_cell(self):
-        """Get the start cell from maze"""
-        return self.maze.grid[self.maze.start[0]][self.maze.start[1]]
+    def _resolve_endpoints(self, start, end):
+        """Fall back to the maze markers when start/end are not given"""
+        start = self.maze.start if start is None else start
+        end = self.maze.end if end is None else end
+        if not (start and end):
+            return None, None
+        return start, end
     
-    def _is_valid_start_end(self):
-        """Check if start and end points are set"""
-        return bool(self.maze.start and self.maze.end)
+    def _get_index(self, position):
+        """Get the flat cell index of a (row, col) position"""
+        return self.maze.index(position[0], position[1])
 
 
 class BFS(PathfindingAlgorithm):
     """Breadth-First Search algorithm"""
     
-    def solve(self, screen, offset_x, offset_y, cell_size, delay=10):
+    name = "bfs"
+    
+    def steps(self, start=None, end=None, result=None):
         """Find path using BFS"""
-        if not self._is_valid_start_end():
-            return False
+        start, end = self._resolve_endpoints(start, end)
+        if result is None:
+            result = SolveResult(self.name)
+        if start is None:
+            return None
         
-        self.maze.clear_path()
+        goal = self._get_index(end)
+        cols = self.maze.cols
+        offsets, neighbors = self.maze.adjacency()
+        state = self._search_state()
+        epoch = state.begin()
+        parent = state.parent
+        reached = state.reached
         queue = deque()
-        start_cell = self._get_start_cell()
-        queue.append(start_cell)
-        parent = {start_cell: None}
+        start_index = self._get_index(start)
+        queue.append(start_index)
+        parent[start_index] = -1
+        reached[start_index] = epoch
         
         while queue:
             current = queue.popleft()
             
-            if (current.row, current.col) == self.maze.end:
-                self._reconstruct_path(current, parent)
-                return True
-            
-            current.is_visited_search = True
+            if current == goal:
+                result.open_set_size = len(queue)
+                path = result.path = self._reconstruct_path(current, parent)
+                for row, col in path:
+                    yield (PATH, row, col)
+                return path
             
-            if delay > 0:
-                self._visualize(screen, offset_x, offset_y, cell_size)
-                pygame.time.delay(delay)
+            result.nodes_expanded += 1
+            yield (VISIT, *divmod(current, cols))
             
-            for neighbor in self.maze.get_neighbors_pathfinding(current):
-                if neighbor not in parent:
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                if reached[neighbor] != epoch:
+                    reached[neighbor] = epoch
                     parent[neighbor] = current
                     queue.append(neighbor)
+                    result.nodes_generated += 1
+                    yield (ENQUEUE, *divmod(neighbor, cols))
+            if len(queue) > result.peak_frontier:
+                result.peak_frontier = len(queue)
         
-        return False
+        return None
     
 class DFS(PathfindingAlgorithm):
     """Depth-First Search algorithm"""
     
-    def solve(self, screen, offset_x, offset_y, cell_size, delay=10):
+    name = "dfs"
+    
+    def steps(self, start=None, end=None, result=None):
         """Find path using DFS"""
-        if not self._is_valid_start_end():
-            return False
+        start, end = self._resolve_endpoints(start, end)
+        if result is None:
+            result = SolveResult(self.name)
+        if start is None:
+            return None
         
-        self.maze.clear_path()
-        stack = [self._get_start_cell()]
-        parent = {stack[0]: None}
+        goal = self._get_index(end)
+        cols = self.maze.cols
+        offsets, neighbors = self.maze.adjacency()
+        state = self._search_state()
+        epoch = state.begin()
+        parent = state.parent
+        reached = state.reached
+        expanded = state.closed
+        stack = [self._get_index(start)]
+        parent[stack[0]] = -1
+        reached[stack[0]] = epoch
         
         while stack:
             current = stack.pop()
             
-            if (current.row, current.col) == self.maze.end:
-                self._reconstruct_path(current, parent)
-                return True
+            if current == goal:
+                result.open_set_size = len(stack)
+                path = result.path = self._reconstruct_path(current, parent)
+                for row, col in path:
+                    yield (PATH, row, col)
+                return path
             
-            if not current.is_visited_search:
-                current.is_visited_search = True
-                
-                if delay > 0:
-                    self._visualize(screen, offset_x, offset_y, cell_size)
-                    pygame.time.delay(delay)
+            if expanded[current] != epoch:
+                expanded[current] = epoch
+                result.nodes_expanded += 1
+                yield (VISIT, *divmod(current, cols))
                 
-                for neighbor in self.maze.get_neighbors_pathfinding(current):
-                    if neighbor not in parent:
+                for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                    if reached[neighbor] != epoch:
+                        reached[neighbor] = epoch
                         parent[neighbor] = current
                         stack.append(neighbor)
+                        result.nodes_generated += 1
+                        yield (ENQUEUE, *divmod(neighbor, cols))
+                if len(stack) > result.peak_frontier:
+                    result.peak_frontier = len(stack)
         
-        return False
+        return None
 
 
 class AStar(PathfindingAlgorithm):
     """A* Search algorithm with Manhattan distance heuristic"""
     
-    def solve(self, screen, offset_x, offset_y, cell_size, delay=10):
+    name = "astar"
+    
+    def steps(self, start=None, end=None, result=None):
         """Find path using A*"""
-        if not self._is_valid_start_end():
-            return False
-        
-        self.maze.clear_path()
+        start, end = self._resolve_endpoints(start, end)
+        if result is None:
+            result = SolveResult(self.name)
+        if start is None:
+            return None
         
-        def heuristic(cell):
+        goal = self._get_index(end)
+        cols = self.maze.cols
+        offsets, neighbors = self.maze.adjacency()
+        def heuristic(index):
             """Manhattan distance heuristic"""
-            return abs(cell.row - self.maze.end[0]) + abs(cell.col - self.maze.end[1])
+            row, col = divmod(index, cols)
+            return abs(row - end[0]) + abs(col - end[1])
         
-        start_cell = self._get_start_cell()
-        open_set = [(0, id(start_cell), start_cell)]
-        parent = {start_cell: None}
-        g_score = {start_cell: 0}
+        state = self._search_state()
+        epoch = state.begin()
+        parent = state.parent
+        g_score = state.cost
+        reached = state.reached
+        start_index = self._get_index(start)
+        open_set = [(0, start_index)]
+        result.heap_pushes += 1
+        parent[start_index] = -1
+        g_score[start_index] = 0
+        reached[start_index] = epoch
         
         while open_set:
-            _, _, current = heapq.heappop(open_set)
+            _, current = heapq.heappop(open_set)
+            result.heap_pops += 1
             
-            if (current.row, current.col) == self.maze.end:
-                self._reconstruct_path(current, parent)
-                return True
+            if current == goal:
+                result.open_set_size = len(open_set)
+                path = result.path = self._reconstruct_path(current, parent)
+                for row, col in path:
+                    yield (PATH, row, col)
+                return path
             
-            current.is_visited_search = True
+            result.nodes_expanded += 1
+            yield (VISIT, *divmod(current, cols))
             
-            if delay > 0:
-                self._visualize(screen, offset_x, offset_y, cell_size)
-                pygame.time.delay(delay)
-            
-            for neighbor in self.maze.get_neighbors_pathfinding(current):
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
                 tentative_g = g_score[current] + 1
                 
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                if reached[neighbor] != epoch or tentative_g < g_score[neighbor]:
+                    reached[neighbor] = epoch
                     parent[neighbor] = current
                     g_score[neighbor] = tentative_g
                     f_score = tentative_g + heuristic(neighbor)
-                    heapq.heappush(open_set, (f_score, id(neighbor), neighbor))
+                    heapq.heappush(open_set, (f_score, neighbor))
+                    result.heap_pushes += 1
+                    result.nodes_generated += 1
+                    yield (ENQUEUE, *divmod(neighbor, cols))
+            if len(open_set) > result.peak_frontier:
+                result.peak_frontier = len(open_set)
         
-        return False
+        return None
     
 
 class Dijkstra(PathfindingAlgorithm):
     """Dijkstra's Algorithm (uniform-cost search without heuristic)"""
 
-    def solve(self, screen, offset_x, offset_y, cell_size, delay=10):
+    name = "dijkstra"
+
+    def steps(self, start=None, end=None, result=None):
         """Find path using Dijkstra's algorithm"""
-        if not self._is_valid_start_end():
-            return False
+        start, end = self._resolve_endpoints(start, end)
+        if result is None:
+            result = SolveResult(self.name)
+        if start is None:
+            return None
 
-        self.maze.clear_path()
+        goal = self._get_index(end)
+        cols = self.maze.cols
+        offsets, neighbors = self.maze.adjacency()
 
-        start_cell = self._get_start_cell()
+        start_index = self._get_index(start)
 
-        # distance (g-cost) from start
-        dist = {start_cell: 0}
-        parent = {start_cell: None}
+        # distance (g-cost) from start, valid where reached in this epoch
+        state = self._search_state()
+        epoch = state.begin()
+        dist = state.cost
+        parent = state.parent
+        reached = state.reached
+        closed = state.closed
+        dist[start_index] = 0
+        parent[start_index] = -1
+        reached[start_index] = epoch
 
-        # priority queue: (cost, tie_breaker, cell)
-        open_set = [(0, id(start_cell), start_cell)]
+        # priority queue: (cost, cell index)
+        open_set = [(0, start_index)]
+        result.heap_pushes += 1
 
         while open_set:
-            current_cost, _, current = heapq.heappop(open_set)
+            current_cost, current = heapq.heappop(open_set)
+            result.heap_pops += 1
 
             # If we've reached the end, reconstruct path
-            if (current.row, current.col) == self.maze.end:
-                self._reconstruct_path(current, parent)
-                return True
+            if current == goal:
+                result.open_set_size = len(open_set)
+                path = result.path = self._reconstruct_path(current, parent)
+                for row, col in path:
+                    yield (PATH, row, col)
+                return path
 
-            if current.is_visited_search:
+            if closed[current] == epoch:
                 # Already processed with a better cost
                 continue
 
-            current.is_visited_search = True
-
-            # Visualize progress
-            if delay > 0:
-                self._visualize(screen, offset_x, offset_y, cell_size)
-                pygame.time.delay(delay)
+            closed[current] = epoch
+            result.nodes_expanded += 1
+            yield (VISIT, *divmod(current, cols))
 
             # Relax edges to neighbors
-            for neighbor in self.maze.get_neighbors_pathfinding(current):
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
                 new_cost = current_cost + 1   # all edges weight = 1
 
-                if neighbor not in dist or new_cost < dist[neighbor]:
+                if reached[neighbor] != epoch or new_cost < dist[neighbor]:
+                    reached[neighbor] = epoch
                     dist[neighbor] = new_cost
                     parent[neighbor] = current
-                    heapq.heappush(open_set, (new_cost, id(neighbor), neighbor))
+                    heapq.heappush(open_set, (new_cost, neighbor))
+                    result.heap_pushes += 1
+                    result.nodes_generated += 1
+                    yield (ENQUEUE, *divmod(neighbor, cols))
+            if len(open_set) > result.peak_frontier:
+                result.peak_frontier = len(open_set)
 
         # No path found
-        return False
+        return None
+
+
+class BidirectionalSearch(PathfindingAlgorithm):
+    """Base class for searches that grow from the start and the end at once
+    
+    Both searches keep their own SearchState. They stop once a cell reached
+    from both sides proves the shortest path, which is then joined from the
+    two halves at that meeting cell. The backward search walks passages in
+    reverse, which relies on every wall being set on both of its cells, as
+    the maze generators keep them.
+    """
+    
+    def _states_for_search(self):
+        """Start a search in both directions; returns the two (state, epoch) pairs"""
+        forward = self._search_state("forward")
+        backward = self._search_state("backward")
+        return (forward, forward.begin()), (backward, backward.begin())
+    
+    def _join_paths(self, meet, forward_parent, backward_parent):
+        """Path from start to end through the meeting cell"""
+        path = self._reconstruct_path(meet, forward_parent)
+        tail = self._reconstruct_path(meet, backward_parent)
+        tail.reverse()
+        return path + tail[1:]
+    
+    def _finish(self, result, meet, forward, backward, open_set_size):
+        """Record the joined path on the result and yield its PATH events"""
+        result.open_set_size = open_set_size
+        path = result.path = self._join_paths(meet, forward.parent, backward.parent)
+        for row, col in path:
+            yield (PATH, row, col)
+        return path
+
+
+class BidirectionalBFS(BidirectionalSearch):
+    """Breadth-First Search from both ends, meeting in the middle
+    
+    Each round expands one whole layer of the smaller frontier. The first
+    layer that reaches cells of the other search holds the shortest path,
+    so the search stops after that layer, at its best meeting cell.
+    """
+    
+    name = "bibfs"
+    
+    def steps(self, start=None, end=None, result=None):
+        """Find path using bidirectional BFS"""
+        start, end = self._resolve_endpoints(start, end)
+        if result is None:
+            result = SolveResult(self.name)
+        if start is None:
+            return None
+        
+        cols = self.maze.cols
+        offsets, neighbors = self.maze.adjacency()
+        (forward, forward_epoch), (backward, backward_epoch) = self._states_for_search()
+        start_index = self._get_index(start)
+        goal = self._get_index(end)
+        for state, epoch, index in ((forward, forward_epoch, start_index),
+                                    (backward, backward_epoch, goal)):
+            state.reached[index] = epoch
+            state.parent[index] = -1
+            state.cost[index] = 0
+        if start_index == goal:
+            return (yield from self._finish(result, goal, forward, backward, 0))
+        
+        frontiers = {"forward": [start_index], "backward": [goal]}
+        sides = {"forward": (forward, forward_epoch, backward, backward_epoch),
+                 "backward": (backward, backward_epoch, forward, forward_epoch)}
+        
+        while frontiers["forward"] and frontiers["backward"]:
+            side = "forward" if len(frontiers["forward"]) <= len(frontiers["backward"]) else "backward"
+            state, epoch, other, other_epoch = sides[side]
+            reached, parent, cost = state.reached, state.parent, state.cost
+            other_reached, other_cost = other.reached, other.cost
+            
+            best = meet = None
+            next_layer = []
+            for current in frontiers[side]:
+                result.nodes_expanded += 1
+                yield (VISIT, *divmod(current, cols))
+                
+                for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                    if reached[neighbor] == epoch:
+                        continue
+                    reached[neighbor] = epoch
+                    parent[neighbor] = current
+                    cost[neighbor] = cost[current] + 1
+                    next_layer.append(neighbor)
+                    result.nodes_generated += 1
+                    yield (ENQUEUE, *divmod(neighbor, cols))
+                    
+                    if other_reached[neighbor] == other_epoch:
+                        length = cost[neighbor] + other_cost[neighbor]
+                        if best is None or length < best:
+                            best, meet = length, neighbor
+            
+            frontiers[side] = next_layer
+            frontier_size = len(frontiers["forward"]) + len(frontiers["backward"])
+            if frontier_size > result.peak_frontier:
+                result.peak_frontier = frontier_size
+            if meet is not None:
+                return (yield from self._finish(result, meet, forward, backward, frontier_size))
+        
+        return None
+
+
+class BidirectionalAStar(BidirectionalSearch):
+    """A* from both ends with balanced Manhattan heuristics
+    
+    Both sides use the same potential, half the distance still to go minus
+    half the distance already covered: (h_end - h_start) / 2 forward and
+    its negation backward. Scores are kept doubled so they stay integers.
+    Any cell reached from both sides gives a path, and the best one so far
+    bounds the answer. With balanced potentials a path through a cell costs
+    exactly the sum of its two f-scores, so the search stops once the two
+    lowest f-scores add up to the best path. Each round expands the side
+    with the smaller open set.
+    """
+    
+    name = "biastar"
+    
+    def steps(self, start=None, end=None, result=None):
+        """Find path using bidirectional A*"""
+        start, end = self._resolve_endpoints(start, end)
+        if result is None:
+            result = SolveResult(self.name)
+        if start is None:
+            return None
+        
+        cols = self.maze.cols
+        offsets, neighbors = self.maze.adjacency()
+        (forward, forward_epoch), (backward, backward_epoch) = self._states_for_search()
+        start_index = self._get_index(start)
+        goal = self._get_index(end)
+        
+        def balanced(source, target):
+            """Doubled potential: Manhattan distance to target minus distance to source"""
+            source_row, source_col = source
+            target_row, target_col = target
+            def heuristic(index):
+                row, col = divmod(index, cols)
+                return (abs(row - target_row) + abs(col - target_col)
+                        - abs(row - source_row) - abs(col - source_col))
+            return heuristic
+        
+        sides = {
+            "forward": (forward, forward_epoch, backward, backward_epoch, balanced(start, end), []),
+            "backward": (backward, backward_epoch, forward, forward_epoch, balanced(end, start), []),
+        }
+        for side, index in (("forward", start_index), ("backward", goal)):
+            state, epoch, _, _, heuristic, open_set = sides[side]
+            state.reached[index] = epoch
+            state.parent[index] = -1
+            state.cost[index] = 0
+            open_set.append((heuristic(index), index))
+            result.heap_pushes += 1
+        forward_open = sides["forward"][5]
+        backward_open = sides["backward"][5]
+        
+        best = meet = None
+        if start_index == goal:
+            best, meet = 0, goal
+        
+        while forward_open and backward_open:
+            if best is not None and forward_open[0][0] + backward_open[0][0] >= 2 * best:
+                break
+            side = "forward" if len(forward_open) <= len(backward_open) else "backward"
+            state, epoch, other, other_epoch, heuristic, open_set = sides[side]
+            reached, parent, g_score, closed = state.reached, state.parent, state.cost, state.closed
+            
+            f_score, current = heapq.heappop(open_set)
+            result.heap_pops += 1
+            if closed[current] == epoch:
+                # Stale entry: the cell was pushed again with a better score
+                continue
+            
+            closed[current] = epoch
+            result.nodes_expanded += 1
+            yield (VISIT, *divmod(current, cols))
+            
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                tentative_g = g_score[current] + 1
+                if reached[neighbor] == epoch and tentative_g >= g_score[neighbor]:
+                    continue
+                reached[neighbor] = epoch
+                parent[neighbor] = current
+                g_score[neighbor] = tentative_g
+                heapq.heappush(open_set, (2 * tentative_g + heuristic(neighbor), neighbor))
+                result.heap_pushes += 1
+                result.nodes_generated += 1
+                yield (ENQUEUE, *divmod(neighbor, cols))
+                
+                if other.reached[neighbor] == other_epoch:
+                    length = tentative_g + other.cost[neighbor]
+                    if best is None or length < best:
+                        best, meet = length, neighbor
+            
+            frontier_size = len(forward_open) + len(backward_open)
+            if frontier_size > result.peak_frontier:
+                result.peak_frontier = frontier_size
+        
+        if meet is None:
+            return None
+        return (yield from self._finish(result, meet, forward, backward,
+                                        len(forward_open) + len(backward_open)))
+
+
+class TreePath(BFS):
+    """Instant lookup of the one path of a perfect maze through its TreeIndex
+    
+    Nothing is searched, so nothing is expanded: the path is read off the
+    index in time proportional to its length. On a maze with loops there
+    is no tree index and it steps aside for a plain BFS.
+    """
+    
+    name = "tree"
+    
+    def prepare(self, start=None, end=None):
+        """Build the maze's tree index"""
+        self.maze.tree_index()
+    
+    def steps(self, start=None, end=None, result=None):
+        """Find path using the maze's tree index, or BFS without one"""
+        index = self.maze.tree_index()
+        if index is None:
+            return (yield from super().steps(start, end, result))
+        
+        start, end = self._resolve_endpoints(start, end)
+        if result is None:
+            result = SolveResult(self.name)
+        if start is None:
+            return None
+        
+        path = result.path = [self.maze.position(cell) for cell in
+                              index.path(self._get_index(start), self._get_index(end))]
+        for row, col in path:
+            yield (PATH, row, col)
+        return path
+
+
+class JunctionDijkstra(PathfindingAlgorithm):
+    """Dijkstra's algorithm over the maze's junction graph
+    
+    Each corridor is crossed in one weighted step, so only junctions and
+    dead ends are expanded. A start or end inside a corridor is linked to
+    the nodes at both ends of it, and the path is expanded back to every
+    cell once the end is reached.
+    """
+    
+    name = "jdijkstra"
+    
+    def prepare(self, start=None, end=None):
+        """Build the maze's junction graph"""
+        self.maze.junction_graph()
+    
+    def _heuristic(self, end):
+        """Estimate of the steps left from a cell to the end; none for Dijkstra"""
+        return lambda index: 0
+    
+    def steps(self, start=None, end=None, result=None):
+        """Find path by searching the junction graph"""
+        start, end = self._resolve_endpoints(start, end)
+        if result is None:
+            result = SolveResult(self.name)
+        if start is None:
+            return None
+        
+        cols = self.maze.cols
+        graph = self.maze.junction_graph()
+        edge_offsets = graph.edge_offsets
+        targets, weights, lasts = graph.edge_targets, graph.edge_weights, graph.edge_lasts
+        heuristic = self._heuristic(end)
+        start_index = self._get_index(start)
+        goal = self._get_index(end)
+        
+        # Links out of a start inside a corridor: (node or goal, steps, cell before it)
+        start_links = None
+        if not graph.is_node(start_index):
+            start_links = [(node, length, last) for _, node, length, last
+                           in self._corridor_links(graph, start_index, goal) if node != start_index]
+        # Links into an end inside a corridor, by the node they leave from
+        goal_links = {}
+        if not graph.is_node(goal) and goal != start_index:
+            for first, node, length, _ in self._corridor_links(graph, goal):
+                if node != goal and (node not in goal_links or length < goal_links[node][1]):
+                    goal_links[node] = (goal, length, first)
+        
+        state = self._search_state()
+        epoch = state.begin()
+        parent = state.parent
+        cost = state.cost
+        reached = state.reached
+        closed = state.closed
+        parent[start_index] = -1
+        cost[start_index] = 0
+        reached[start_index] = epoch
+        open_set = [(heuristic(start_index), start_index)]
+        result.heap_pushes += 1
+        
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            result.heap_pops += 1
+            
+            if current == goal:
+                result.open_set_size = len(open_set)
+                path = result.path = self._expand_path(graph, start_index, goal, parent)
+                for row, col in path:
+                    yield (PATH, row, col)
+                return path
+            
+            if closed[current] == epoch:
+                # Already expanded with a lower cost
+                continue
+            closed[current] = epoch
+            result.nodes_expanded += 1
+            yield (VISIT, *divmod(current, cols))
+            
+            if current == start_index and start_links is not None:
+                links = start_links
+            else:
+                first, stop = edge_offsets[current], edge_offsets[current + 1]
+                links = zip(targets[first:stop], weights[first:stop], lasts[first:stop])
+                if current in goal_links:
+                    links = chain(links, [goal_links[current]])
+            
+            for neighbor, weight, last in links:
+                new_cost = cost[current] + weight
+                if reached[neighbor] != epoch or new_cost < cost[neighbor]:
+                    reached[neighbor] = epoch
+                    cost[neighbor] = new_cost
+                    parent[neighbor] = last
+                    heapq.heappush(open_set, (new_cost + heuristic(neighbor), neighbor))
+                    result.heap_pushes += 1
+                    result.nodes_generated += 1
+                    yield (ENQUEUE, *divmod(neighbor, cols))
+            if len(open_set) > result.peak_frontier:
+                result.peak_frontier = len(open_set)
+        
+        return None
+    
+    def _corridor_links(self, graph, cell, stop=-1):
+        """Walk both ways out of a corridor cell
+        
+        Returns (first step, end cell, steps, cell before the end) for each
+        direction; a walk back to ``cell`` went round a closed loop.
+        """
+        return [(first, *graph.walk(cell, first, stop))
+                for first in graph.neighbors[graph.offsets[cell]:graph.offsets[cell + 1]]]
+    
+    def _expand_path(self, graph, start_index, goal, parent):
+        """Path from start to goal as (row, col) positions, corridors included
+        
+        The parent of a node is the cell before it on the corridor it was
+        reached through, so walking back from there leads to the previous
+        node (or the start) one corridor at a time.
+        """
+        cells = [goal]
+        current = goal
+        while parent[current] != -1:
+            current, _, _ = graph.walk(current, parent[current], start_index, cells)
+        cells.reverse()
+        return [self.maze.position(cell) for cell in cells]
+
+
+class JunctionAStar(JunctionDijkstra):
+    """A* over the maze's junction graph, with the Manhattan distance heuristic
+    
+    A corridor is never shorter than the Manhattan distance between its
+    ends, so the heuristic stays consistent on the contracted graph.
+    """
+    
+    name = "jastar"
+    
+    def _heuristic(self, end):
+        cols = self.maze.cols
+        end_row, end_col = end
+        def heuristic(index):
+            """Manhattan distance heuristic"""
+            row, col = divmod(index, cols)
+            return abs(row - end_row) + abs(col - end_col)
+        return heuristic
+
+
+class DistanceFieldPath(PathfindingAlgorithm):
+    """Path down the end's distance field, cached on the maze
+    
+    The first query for an end runs one BFS out of it over the whole maze.
+    Every later query for the same end, from any start, only walks down
+    its path, so nothing is expanded.
+    """
+    
+    name = "field"
+    
+    def prepare(self, start=None, end=None):
+        """Build the distance field of the end"""
+        start, end = self._resolve_endpoints(start, end)
+        if end is not None:
+            self.maze.distance_field(self._get_index(end))
+    
+    def steps(self, start=None, end=None, result=None):
+        """Find path by walking down the distance field of the end"""
+        start, end = self._resolve_endpoints(start, end)
+        if result is None:
+            result = SolveResult(self.name)
+        if start is None:
+            return None
+        
+        field = self.maze.distance_field(self._get_index(end))
+        cells = field.path_from(self._get_index(start))
+        if cells is None:
+            return None
+        path = result.path = [self.maze.position(cell) for cell in cells]
+        for row, col in path:
+            yield (PATH, row, col)
+        return path
+
+
+# Headless registry used by solve() and batch tooling
+ALGORITHMS = {
+    "bfs": BFS,
+    "dfs": DFS,
+    "astar": AStar,
+    "dijkstra": Dijkstra,
+    "bibfs": BidirectionalBFS,
+    "biastar": BidirectionalAStar,
+    "tree": TreePath,
+    "jdijkstra": JunctionDijkstra,
+    "jastar": JunctionAStar,
+    "field": DistanceFieldPath,
+}
+
+
+def solve(maze, start, end, algorithm="bfs"):
+    """Solve the maze without any rendering and return its SolveResult"""
+    return ALGORITHMS[algorithm](maze).solve(start, end)
+
+
+def apply_step(maze, event):
+    """Apply a step event to the maze's display flags"""
+    kind, row, col = event
+    if kind == VISIT:
+        maze.set_flag(row, col, FLAG_SEARCHED)
+    elif kind == PATH:
+        maze.set_flag(row, col, FLAG_PATH)
+
+
+class SolveTask:
+    """A search that a main loop advances cooperatively, a slice per frame
+    
+    Each call to advance() applies step events to the maze until a step
+    count or a time budget runs out, so the caller stays responsive however
+    large the search is. Events are also passed to an optional trace
+    recorder with a record(event) method. ``result`` is the live SolveResult:
+    time spent inside the search goes to its compute_ns, time spent applying
+    and recording events to its render_ns.
+    """
+    
+    # Events applied between clock checks
+    CLOCK_CHECK_INTERVAL = 64
+    
+    def __init__(self, maze, algorithm, start=None, end=None, trace=None):
+        self.maze = maze
+        self.result = SolveResult(algorithm.name)
+        self.events = algorithm.steps(start, end, self.result)
+        self.trace = trace
+        self.paused = False
+        self.finished = False
+        self.path_length = 0
+    
+    @property
+    def nodes_visited(self):
+        return self.result.nodes_expanded
+    
+    def advance(self, max_steps, budget):
+        """Apply events until max_steps nodes were expanded or budget seconds passed"""
+        clock = time.perf_counter_ns
+        started = clock()
+        deadline = started + int(budget * 1e9)
+        maze = self.maze
+        events = self.events
+        record = self.trace.record if self.trace is not None else None
+        compute_ns = 0
+        applied = 0
+        
+        while True:
+            before = clock()
+            try:
+                event = next(events)
+            except StopIteration:
+                compute_ns += clock() - before
+                self.finished = True
+                break
+            compute_ns += clock() - before
+            
+            apply_step(maze, event)
+            if record:
+                record(event)
+            kind = event[0]
+            if kind == VISIT:
+                max_steps -= 1
+                if max_steps <= 0:
+                    break
+            elif kind == PATH:
+                self.path_length += 1
+            
+            applied += 1
+            if applied % self.CLOCK_CHECK_INTERVAL == 0 and clock() >= deadline:
+                break
+        
+        self.result.compute_ns += compute_ns
+        self.result.render_ns += clock() - started - compute_ns
\ No newline at end of file
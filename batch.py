@@ -0,0 +1,247 @@
+"""
+Batch solving: many (start, end, algorithm) queries on one maze, spread over
+a process pool
+
+The maze walls and its adjacency index are published once in shared memory.
+Every worker attaches to them when it starts, so queries carry only their
+endpoints, nothing maze-sized is ever pickled and no worker rebuilds the
+index. Results stream back chunk by chunk as workers finish them.
+
+    python batch.py --rows 500 --cols 500 --seed 1 --queries 10000 --algorithm all --output results.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from algorithms import ALGORITHMS
+from constants import SOLVE_CACHE_BYTES
+from maze import Maze
+from results import SolveResult
+from search_trace import SearchTrace
+from solve_cache import SolveCache
+
+
+# Queries sent to a worker at a time: large enough to amortize the
+# inter-process round trip, small enough to keep every worker busy
+DEFAULT_CHUNK_SIZE = 64
+
+# Bytes per entry of the adjacency index arrays
+_INDEX_BYTES = array('i').itemsize
+
+# Per-worker state, set up once by _attach_worker
+_worker_maze = None
+_worker_memory = None
+_worker_algorithms = {}
+_worker_cache = None
+
+
+def _shared_layout(size, neighbor_count):
+    """Byte ranges of the walls, offsets and neighbors in the shared memory"""
+    offsets_start = -(-size // _INDEX_BYTES) * _INDEX_BYTES
+    neighbors_start = offsets_start + (size + 1) * _INDEX_BYTES
+    end = neighbors_start + neighbor_count * _INDEX_BYTES
+    return (0, size), (offsets_start, neighbors_start), (neighbors_start, end)
+
+
+def _attach_worker(name, rows, cols, neighbor_count, cache_bytes):
+    """Pool initializer: attach to the shared maze walls and adjacency index"""
+    global _worker_maze, _worker_memory, _worker_cache
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    buffer = _worker_memory.buf
+    walls, offsets, neighbors = _shared_layout(rows * cols, neighbor_count)
+    _worker_maze = Maze(rows, cols, walls=buffer[slice(*walls)])
+    _worker_maze.use_adjacency(buffer[slice(*offsets)].cast('i'),
+                               buffer[slice(*neighbors)].cast('i'))
+    _worker_algorithms.clear()
+    _worker_cache = SolveCache(cache_bytes)
+
+
+def _solve_chunk(chunk, keep_paths):
+    """Worker task: solve a list of (number, start, end, algorithm) queries"""
+    solved = []
+    for number, start, end, algorithm in chunk:
+        solver = _worker_algorithms.get(algorithm)
+        if solver is None:
+            solver = _worker_algorithms[algorithm] = ALGORITHMS[algorithm](_worker_maze)
+        result = _worker_cache.solve(_worker_maze, solver, start, end)
+        if not keep_paths:
+            result.drop_path()
+        solved.append((number, result))
+    return solved
+
+
+def _capture_chunk(chunk):
+    """Worker task: record a SearchTrace for each (number, start, end, algorithm) query"""
+    captured = []
+    for number, start, end, algorithm in chunk:
+        solver = ALGORITHMS[algorithm](_worker_maze)
+        captured.append((number, SearchTrace.capture(_worker_maze, solver, start, end, algorithm)))
+    return captured
+
+
+class BatchSolver:
+    """Solves queries on one maze across a ProcessPoolExecutor
+
+    Use it as a context manager so the pool and the shared memory are
+    released. The maze's walls and adjacency index are copied into shared
+    memory once, when the solver is created; later changes to the maze are
+    not seen. Each worker keeps a SolveCache of up to ``cache_bytes``, so a
+    query asked again is only solved once per worker.
+    """
+
+    def __init__(self, maze, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                 cache_bytes=SOLVE_CACHE_BYTES):
+        self.chunk_size = chunk_size
+        offsets, neighbors = maze.adjacency()
+        walls_range, offsets_range, neighbors_range = _shared_layout(maze.size, len(neighbors))
+        self._memory = shared_memory.SharedMemory(create=True, size=neighbors_range[1])
+        buffer = self._memory.buf
+        buffer[slice(*walls_range)] = maze.walls
+        buffer[slice(*offsets_range)] = memoryview(offsets).cast('B')
+        buffer[slice(*neighbors_range)] = memoryview(neighbors).cast('B')
+        self._pool = ProcessPoolExecutor(workers, initializer=_attach_worker,
+                                         initargs=(self._memory.name, maze.rows, maze.cols,
+                                                   len(neighbors), cache_bytes))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self, cancel=False):
+        """Shut the workers down and free the shared memory
+
+        With cancel=True, queries that have not started yet are dropped
+        instead of waited for. Running ones always finish first, so no
+        worker is still attached when the shared memory is unlinked.
+        """
+        self._pool.shutdown(cancel_futures=cancel)
+        self._memory.close()
+        self._memory.unlink()
+
+    def solve(self, queries, keep_paths=True):
+        """Yield (query number, SolveResult) pairs in completion order
+
+        ``queries`` is an iterable of (start, end, algorithm) tuples, and the
+        query number is its position in it. With keep_paths=False the
+        paths stay in the workers, which saves pickling them back.
+        """
+        for future in as_completed(self.submit(queries, keep_paths=keep_paths)):
+            yield from future.result()
+
+    def submit(self, queries, keep_paths=True, trace=False):
+        """Send queries to the workers without waiting for them
+
+        Returns one future per chunk, each resolving to a list of (query
+        number, result) pairs. With trace=True the results are complete
+        SearchTraces, ready to replay, instead of SolveResults.
+        """
+        chunk = []
+        futures = []
+        for number, (start, end, algorithm) in enumerate(queries):
+            if algorithm not in ALGORITHMS:
+                raise ValueError(f"unknown algorithm: {algorithm}")
+            chunk.append((number, start, end, algorithm))
+            if len(chunk) == self.chunk_size:
+                futures.append(self._submit_chunk(chunk, keep_paths, trace))
+                chunk = []
+        if chunk:
+            futures.append(self._submit_chunk(chunk, keep_paths, trace))
+        return futures
+
+    def _submit_chunk(self, chunk, keep_paths, trace):
+        if trace:
+            return self._pool.submit(_capture_chunk, chunk)
+        return self._pool.submit(_solve_chunk, chunk, keep_paths)
+
+
+def random_queries(maze, count, algorithms, seed=None):
+    """Build count random (start, end, algorithm) queries with distinct endpoints"""
+    rng = random.Random(seed)
+    queries = []
+    while len(queries) < count:
+        start = (rng.randrange(maze.rows), rng.randrange(maze.cols))
+        end = (rng.randrange(maze.rows), rng.randrange(maze.cols))
+        if start != end:
+            queries.append((start, end, rng.choice(algorithms)))
+    return queries
+
+
+def read_queries(filename):
+    """Read queries from a CSV file with start_row,start_col,end_row,end_col,algorithm columns"""
+    with open(filename, newline="") as f:
+        return [((int(row["start_row"]), int(row["start_col"])),
+                 (int(row["end_row"]), int(row["end_col"])), row["algorithm"])
+                for row in csv.DictReader(f)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many maze queries across a process pool")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--cols", type=int, default=200)
+    parser.add_argument("--seed", type=int, help="seed for the maze and the random queries")
+    parser.add_argument("--generator", choices=Maze.GENERATORS, default="backtracker")
+    parser.add_argument("--queries", type=int, default=1000, help="number of random queries")
+    parser.add_argument("--input", metavar="FILE", help="read queries from a CSV file instead")
+    parser.add_argument("--algorithm", choices=[*ALGORITHMS, "all"], default="bfs",
+                        help="algorithm of the random queries (all picks one per query)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--cache-mb", type=float, default=SOLVE_CACHE_BYTES / 2 ** 20,
+                        help="memory cap of each worker's result cache (0 turns it off)")
+    parser.add_argument("--output", metavar="FILE", help="stream the results to a CSV file")
+    args = parser.parse_args(argv)
+
+    maze = Maze(args.rows, args.cols)
+    maze.generate_maze(args.seed, args.generator)
+    if args.input:
+        queries = read_queries(args.input)
+    else:
+        algorithms = list(ALGORITHMS) if args.algorithm == "all" else [args.algorithm]
+        queries = random_queries(maze, args.queries, algorithms, args.seed)
+
+    output = open(args.output, "w", newline="") if args.output else None
+    writer = None
+    if output:
+        writer = csv.writer(output)
+        writer.writerow(["query", "start_row", "start_col", "end_row", "end_col", *SolveResult.FIELDS])
+
+    started = time.perf_counter()
+    solved = 0
+    try:
+        cache_bytes = int(args.cache_mb * 2 ** 20)
+        with BatchSolver(maze, args.workers, args.chunk_size, cache_bytes) as solver:
+            for number, result in solver.solve(queries, keep_paths=False):
+                solved += 1
+                if writer:
+                    start, end, _ = queries[number]
+                    writer.writerow([number, *start, *end, *result.to_dict().values()])
+    finally:
+        if output:
+            output.close()
+    elapsed = time.perf_counter() - started
+
+    print(json.dumps({
+        "rows": args.rows,
+        "cols": args.cols,
+        "queries": solved,
+        "workers": args.workers or os.cpu_count(),
+        "seconds": elapsed,
+        "queries_per_second": solved / elapsed if elapsed else 0,
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Reproducible benchmarks for maze generation, solving and rendering
+
+Every run uses the same seeded mazes over a ladder of sizes, so timings
+from different commits are comparable. Save a baseline once, then compare
+later runs against it:
+
+    python benchmark.py --save bench_baseline.json
+    python benchmark.py --compare bench_baseline.json
+
+Rendering is measured headless through SDL's dummy video driver.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from algorithms import ALGORITHMS, apply_step
+from camera import Camera
+from constants import WINDOW_WIDTH, WINDOW_HEIGHT, CELL_SIZE, MAZE_VIEW_WIDTH, MAZE_VIEW_HEIGHT
+from distance_field import DistanceField
+from junction_graph import JunctionGraph
+from maze import Maze
+from tree_index import TreeIndex
+
+
+DEFAULT_SIZES = [(25, 38), (100, 100), (500, 500), (1000, 1000), (2000, 2000)]
+DEFAULT_SEED = 1234
+DEFAULT_REPEAT = 3
+
+# A case counts as a regression if it takes this fraction longer than its baseline
+DEFAULT_THRESHOLD = 0.15
+
+
+class BenchmarkResult:
+    """Best time, peak traced memory and throughput of one benchmark case"""
+
+    def __init__(self, name, seconds, peak_bytes, nodes=0):
+        self.name = name
+        self.seconds = seconds
+        self.peak_bytes = peak_bytes
+        self.nodes = nodes
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.seconds if self.nodes and self.seconds else 0
+
+    def to_dict(self):
+        return {"seconds": self.seconds, "peak_bytes": self.peak_bytes,
+                "nodes_per_second": self.nodes_per_second}
+
+
+def measure(name, run, repeat, nodes=0):
+    """Time run() as the best of repeat calls, then trace its peak memory in one more call
+
+    Memory is measured in a separate call because tracemalloc slows down
+    the code it traces, which would skew the timings. As in timeit, the
+    garbage collector is off while timing so its pauses do not add noise.
+    """
+    best = float("inf")
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - started)
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return BenchmarkResult(name, best, peak, nodes)
+
+
+def benchmark_size(rows, cols, seed, repeat, screen):
+    """Run every benchmark case on one seeded maze size"""
+    label = f"{rows}x{cols}"
+    maze = Maze(rows, cols)
+    results = [measure(f"generate {label}", lambda: maze.generate_maze(seed), repeat, maze.size)]
+    maze.generate_maze(seed)
+
+    def scan_neighbors():
+        for index in range(maze.size):
+            maze.open_neighbors(index)
+    results.append(measure(f"neighbors {label}", scan_neighbors, repeat, maze.size))
+    results.append(measure(f"adjacency {label}", maze._build_adjacency, repeat, maze.size))
+    results.append(measure(f"tree index {label}", lambda: TreeIndex.build(maze), repeat, maze.size))
+    results.append(measure(f"junctions {label}", lambda: JunctionGraph(maze), repeat, maze.size))
+    results.append(measure(f"distance field {label}", lambda: DistanceField(maze, maze.size - 1),
+                           repeat, maze.size))
+
+    start, end = (0, 0), (rows - 1, cols - 1)
+    for name, algorithm_class in ALGORITHMS.items():
+        algorithm = algorithm_class(maze)
+        nodes = algorithm.solve(start, end).nodes_expanded
+        results.append(measure(f"solve {name} {label}",
+                               lambda: algorithm.solve(start, end), repeat, nodes))
+
+    # Draw with a search result on screen, as the visualizer would show it
+    algorithm = ALGORITHMS["bfs"](maze)
+    for event in algorithm.steps(start, end):
+        apply_step(maze, event)
+    maze.start, maze.end = start, end
+    camera = Camera((40, 110, MAZE_VIEW_WIDTH, MAZE_VIEW_HEIGHT), rows, cols)
+    for view_name in ("fit", "zoomed"):
+        while view_name == "zoomed" and camera.cell_size < CELL_SIZE and camera.zoom(1):
+            pass
+        draw = lambda: maze.draw(screen, *camera.origin, camera.cell_size, camera.view)
+        results.append(measure(f"draw {view_name} {label}", draw, repeat))
+    return results
+
+
+def run_benchmarks(sizes, seed, repeat, report=print):
+    """Run the whole suite and return its results, reporting each one as it finishes"""
+    pygame.display.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    results = []
+    report(f"{'case':<28}{'time (ms)':>12}{'peak (KiB)':>12}{'nodes/s':>14}")
+    for rows, cols in sizes:
+        for result in benchmark_size(rows, cols, seed, repeat, screen):
+            report(f"{result.name:<28}{result.seconds * 1000:>12.2f}"
+                   f"{result.peak_bytes / 1024:>12.0f}{result.nodes_per_second:>14,.0f}")
+            results.append(result)
+    pygame.display.quit()
+    return results
+
+
+def save_baseline(results, filename, seed):
+    """Write results to a baseline file, with enough context to judge comparisons"""
+    baseline = {
+        "seed": seed,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {result.name: result.to_dict() for result in results},
+    }
+    with open(filename, "w") as f:
+        json.dump(baseline, f, indent=2)
+
+
+def compare_baseline(results, filename, threshold, report=print):
+    """Compare results with a saved baseline; returns the names of regressed cases"""
+    with open(filename) as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    report(f"\n{'case':<28}{'baseline':>12}{'now':>12}{'change':>10}")
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None:
+            continue
+        change = result.seconds / previous["seconds"] - 1
+        verdict = ""
+        if change > threshold:
+            verdict = "  REGRESSION"
+            regressions.append(result.name)
+        elif change < -threshold:
+            verdict = "  faster"
+        report(f"{result.name:<28}{previous['seconds'] * 1000:>12.2f}"
+               f"{result.seconds * 1000:>12.2f}{change:>+10.0%}{verdict}")
+    return regressions
+
+
+def parse_size(text):
+    """Parse a ROWSxCOLS size argument"""
+    try:
+        rows, cols = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ROWSxCOLS, got {text!r}") from None
+    if rows < 2 or cols < 2:
+        raise argparse.ArgumentTypeError("a maze needs at least 2 rows and 2 columns")
+    return rows, cols
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=parse_size, nargs="+", default=DEFAULT_SIZES,
+                        metavar="ROWSxCOLS", help="maze sizes to benchmark")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="timed runs per case; the best one counts")
+    parser.add_argument("--save", metavar="FILE", help="save the results as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown fraction flagged as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.seed, args.repeat)
+    if args.save:
+        save_baseline(results, args.save, args.seed)
+    if args.compare:
+        regressions = compare_baseline(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Camera for the maze viewport: zoom and pan over mazes larger than the window
+"""
+
+import pygame
+from constants import MIN_CELL_SIZE, MAX_CELL_SIZE, ZOOM_STEP
+
+
+class Camera:
+    """Maps between screen pixels and maze cells inside a fixed viewport
+
+    ``cell_size`` is the zoom level in pixels per cell, and ``x``/``y`` is
+    the maze pixel (at that zoom) shown at the viewport's top-left corner.
+    A maze smaller than the viewport is centred in it. From MIN_CELL_SIZE
+    up the zoom is a whole number of pixels, below it (where the maze is
+    drawn from a pixel buffer) it can be fractional, down to the zoom that
+    fits the whole maze.
+    """
+
+    def __init__(self, view, rows, cols):
+        self.view = pygame.Rect(view)
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = MAX_CELL_SIZE
+        self.x = 0
+        self.y = 0
+        self.fit()
+
+    @property
+    def origin(self):
+        """Screen position of the top-left corner of cell (0, 0)"""
+        return self.view.x - self.x, self.view.y - self.y
+
+    @property
+    def min_cell_size(self):
+        """Smallest zoom: whole tiles, or less where needed to fit the maze"""
+        return min(MIN_CELL_SIZE, self._fit_size())
+
+    def _fit_size(self):
+        """Pixels per cell at which the whole maze just fits the viewport"""
+        return min(self.view.width / self.cols, self.view.height / self.rows)
+
+    def fit(self):
+        """Zoom so the whole maze fits the viewport, as large as possible"""
+        size = self._fit_size()
+        if size >= MIN_CELL_SIZE:
+            size = min(int(size), MAX_CELL_SIZE)
+        self.cell_size = size
+        self.x = self.y = 0
+        self._clamp()
+
+    def screen_to_cell(self, pos):
+        """Get the (row, col) under a screen position, or None outside the maze"""
+        if not self.view.collidepoint(pos):
+            return None
+        origin_x, origin_y = self.origin
+        row = int((pos[1] - origin_y) // self.cell_size)
+        col = int((pos[0] - origin_x) // self.cell_size)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    def pan(self, dx, dy):
+        """Drag the maze by a screen-pixel offset; returns whether the view moved"""
+        previous = (self.x, self.y)
+        self.x -= dx
+        self.y -= dy
+        self._clamp()
+        return (self.x, self.y) != previous
+
+    def zoom(self, steps, pos=None):
+        """Zoom in (positive steps) or out, keeping the maze point under ``pos`` still
+
+        Returns whether the zoom level changed.
+        """
+        size = self.cell_size
+        for _ in range(abs(steps)):
+            if size < MIN_CELL_SIZE or (steps < 0 and size == MIN_CELL_SIZE):
+                size = size * ZOOM_STEP if steps > 0 else size / ZOOM_STEP
+                if size >= MIN_CELL_SIZE:
+                    size = round(size)
+            elif steps > 0:
+                size = max(size + 1, round(size * ZOOM_STEP))
+            else:
+                size = max(min(size - 1, round(size / ZOOM_STEP)), MIN_CELL_SIZE)
+        size = min(max(size, self.min_cell_size), MAX_CELL_SIZE)
+        if size == self.cell_size:
+            return False
+
+        if pos is None:
+            pos = self.view.center
+        view_x = pos[0] - self.view.x
+        view_y = pos[1] - self.view.y
+        scale = size / self.cell_size
+        self.x = round((self.x + view_x) * scale - view_x)
+        self.y = round((self.y + view_y) * scale - view_y)
+        self.cell_size = size
+        self._clamp()
+        return True
+
+    def _clamp(self):
+        """Keep the maze covering the viewport, or centred along an axis where it is smaller"""
+        width = self.cols * self.cell_size
+        height = self.rows * self.cell_size
+        if width <= self.view.width:
+            self.x = -((self.view.width - width) // 2)
+        else:
+            self.x = min(max(self.x, 0), width - self.view.width)
+        if height <= self.view.height:
+            self.y = -((self.view.height - height) // 2)
+        else:
+            self.y = min(max(self.y, 0), height - self.view.height)
\ No newline at end of file
@@ -7,10 +7,19 @@ WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
 CONTROL_PANEL_HEIGHT = 120
 
-# Maze dimensions
+# Maze dimensions (defaults; the maze viewport is sized to fit them at CELL_SIZE)
 CELL_SIZE = 22
 MAZE_ROWS = 25
 MAZE_COLS = 38
+MAZE_VIEW_WIDTH = MAZE_COLS * CELL_SIZE
+MAZE_VIEW_HEIGHT = MAZE_ROWS * CELL_SIZE
+
+# Camera zoom limits in pixels per cell, and the zoom factor per wheel step.
+# Below MIN_CELL_SIZE the maze is drawn from a pixel buffer instead of tiles,
+# down to whatever zoom fits the whole maze in view.
+MIN_CELL_SIZE = 4
+MAX_CELL_SIZE = 64
+ZOOM_STEP = 1.25
 
 # Modern Color Palette
 WHITE = (255, 255, 255)
@@ -51,5 +60,47 @@ PATH_BG = (255, 255, 255)          # White path background
 VISITED_COLOR = (174, 214, 241)    # Light blue for visited
 EXPLORING_COLOR = (133, 193, 233)  # Medium blue for exploring
 
-# Algorithm visualization delay (milliseconds)
-VISUALIZATION_DELAY = 15
\ No newline at end of file
+# Frame rate cap while redrawing, and how long the idle loop blocks on
+# pygame.event.wait() before checking again (milliseconds)
+FPS = 60
+IDLE_WAIT_MS = 500
+
+# Maximum number of rendered text surfaces kept by the UI text cache
+TEXT_CACHE_SIZE = 256
+
+# Search animation speed, in expanded nodes applied per rendered frame.
+# None is "auto": the rate that animates the current maze in about
+# TARGET_ANIMATION_SECONDS.
+ANIMATION_SPEEDS = [None, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+DEFAULT_ANIMATION_SPEED = 0   # index into ANIMATION_SPEEDS
+TARGET_ANIMATION_SECONDS = 5
+
+# Time a running search may use per frame (milliseconds), leaving the rest of
+# the ~16 ms frame for event handling and drawing
+SOLVE_FRAME_BUDGET_MS = 8
+
+# Where Ctrl+S / Ctrl+O save and load the last search trace
+TRACE_FILE = "last_search.trace"
+
+# Where Ctrl+E exports the last search's statistics
+RESULTS_JSON_FILE = "solve_result.json"
+RESULTS_CSV_FILE = "solve_results.csv"
+
+# Profiler: frames kept for the F3 HUD percentiles, and the length and file
+# name prefix of an F9 cProfile/tracemalloc capture
+PROFILER_HISTORY = 240
+PROFILE_CAPTURE_FRAMES = 120
+PROFILE_FILE_PREFIX = "profile"
+
+# Race mode: gap between the split panes and height of each pane's title bar
+RACE_PANE_GAP = 6
+RACE_HEADER_HEIGHT = 20
+
+# Distance field heatmap: colours from the goal to the farthest cell, and
+# the opacity of the overlay (0-255)
+HEATMAP_NEAR_COLOR = (231, 76, 60)
+HEATMAP_FAR_COLOR = (142, 68, 173)
+HEATMAP_ALPHA = 110
+
+# Memory cap of the cache of solve results and their recorded searches
+SOLVE_CACHE_BYTES = 64 * 1024 * 1024
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Distance fields: the number of steps from every cell to one goal
+
+One breadth-first search out of the goal labels the whole maze. After that,
+the path from any start is found by stepping downhill, to a neighbour one
+step closer, until the goal is reached, at a cost proportional to the path
+alone.
+"""
+
+from array import array
+
+
+class DistanceField:
+    """Steps to a goal cell from every cell of a maze, -1 where it cannot be reached
+
+    The search runs out of the goal over the passages in their forward
+    direction, which relies on every wall being set on both of its cells,
+    as the maze generators keep them.
+    """
+
+    # Heat levels: 0 at the goal up to FARTHEST at the farthest cell
+    FARTHEST = 254
+    UNREACHABLE = 255
+
+    def __init__(self, maze, goal):
+        self.goal = goal
+        offsets, neighbors = maze.adjacency()
+        self._offsets = offsets
+        self._neighbors = neighbors
+        distance = array('i', [-1]) * maze.size
+        distance[goal] = 0
+        frontier = [goal]
+        steps = 0
+        while frontier:
+            steps += 1
+            layer = []
+            for cell in frontier:
+                for neighbor in neighbors[offsets[cell]:offsets[cell + 1]]:
+                    if distance[neighbor] < 0:
+                        distance[neighbor] = steps
+                        layer.append(neighbor)
+            frontier = layer
+        self.distance = distance
+        self.max_distance = steps - 1
+        self._heat = None
+
+    def path_from(self, start):
+        """Cell indices from start down to the goal, or None when the goal is out of reach"""
+        distance = self.distance
+        if distance[start] < 0:
+            return None
+        offsets = self._offsets
+        neighbors = self._neighbors
+        path = [start]
+        cell = start
+        while cell != self.goal:
+            closer = distance[cell] - 1
+            for neighbor in neighbors[offsets[cell]:offsets[cell + 1]]:
+                if distance[neighbor] == closer:
+                    cell = neighbor
+                    break
+            path.append(cell)
+        return path
+
+    @property
+    def heat(self):
+        """Distances scaled to one byte per cell for drawing, UNREACHABLE where there is none"""
+        if self._heat is None:
+            scale = self.FARTHEST / max(self.max_distance, 1)
+            unreachable = self.UNREACHABLE
+            self._heat = bytes([unreachable if steps < 0 else int(steps * scale)
+                                for steps in self.distance])
+        return self._heat
\ No newline at end of file
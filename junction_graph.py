@@ -0,0 +1,75 @@
+"""
+Corridor contraction: the maze graph reduced to its junctions and dead ends
+
+Most cells of a generated maze lie on corridors with exactly two open sides,
+where a search has no choice to make. The junction graph replaces every
+corridor with one weighted edge between the cells at its ends, so a search
+only expands the cells where the maze branches or stops.
+"""
+
+from array import array
+from itertools import accumulate
+
+
+class JunctionGraph:
+    """The maze's junctions and dead ends, joined by corridor edges
+
+    Nodes keep their cell index, so searches can use per-cell working
+    arrays. The edges leaving node i are the positions
+    ``edge_offsets[i]:edge_offsets[i + 1]`` of three arrays: the node at
+    the far end of the corridor, its length in steps, and the corridor
+    cell just before the far end (the start node itself for a one-step
+    corridor), from which walk() recovers the cells in between. Corridors
+    leading back to where they started never shorten a path and are left
+    out.
+    """
+
+    def __init__(self, maze):
+        offsets, neighbors = maze.adjacency()
+        self.offsets = offsets
+        self.neighbors = neighbors
+        size = maze.size
+        self.nodes = [cell for cell in range(size) if offsets[cell + 1] - offsets[cell] != 2]
+
+        counts = [0] * size
+        self.edge_targets = array('i')
+        self.edge_weights = array('i')
+        self.edge_lasts = array('i')
+        for node in self.nodes:
+            for first in neighbors[offsets[node]:offsets[node + 1]]:
+                target, weight, last = self.walk(node, first)
+                if target != node:
+                    self.edge_targets.append(target)
+                    self.edge_weights.append(weight)
+                    self.edge_lasts.append(last)
+                    counts[node] += 1
+        self.edge_offsets = array('i', accumulate(counts, initial=0))
+
+    def is_node(self, cell):
+        """Whether a cell is a junction or a dead end rather than a corridor cell"""
+        return self.offsets[cell + 1] - self.offsets[cell] != 2
+
+    def walk(self, previous, cell, stop=-1, trail=None):
+        """Follow a corridor from ``previous`` into ``cell`` up to its far end
+
+        The walk ends at the first node, at ``stop`` or back at
+        ``previous`` when the corridor is a closed loop. Returns (end cell,
+        steps taken, cell before the end); with a ``trail`` list, every
+        cell entered is appended to it.
+        """
+        offsets = self.offsets
+        neighbors = self.neighbors
+        origin = previous
+        steps = 1
+        if trail is not None:
+            trail.append(cell)
+        while cell != stop and cell != origin and offsets[cell + 1] - offsets[cell] == 2:
+            first = offsets[cell]
+            following = neighbors[first]
+            if following == previous:
+                following = neighbors[first + 1]
+            previous, cell = cell, following
+            steps += 1
+            if trail is not None:
+                trail.append(cell)
+        return cell, steps, previous
\ No newline at end of file
@@ -1,16 +1,106 @@
 """
 AlgoMaze - Pathfinding Algorithm Visualizer
 A pygame-based application for visualizing maze generation and pathfinding algorithms.
+
+Without options it opens the visualizer. With --headless it generates and
+solves a maze without any window and prints the statistics as JSON, for CI
+and servers without a display.
 """
 
-from visualizer import MazeVisualizer
+import argparse
+import json
+import os
+import sys
+import time
+
+# Keep stdout clean for the JSON report
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from algorithms import ALGORITHMS
+from constants import MAZE_ROWS, MAZE_COLS
+from maze import Maze
+
+
+def parse_position(text):
+    """Parse a ROW,COL position argument"""
+    try:
+        row, col = (int(value) for value in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ROW,COL, got {text!r}") from None
+    return row, col
+
+
+def build_parser():
+    """Command-line options for both the visualizer and headless mode"""
+    parser = argparse.ArgumentParser(description="Maze generation and pathfinding visualizer")
+    parser.add_argument("--rows", type=int, default=MAZE_ROWS)
+    parser.add_argument("--cols", type=int, default=MAZE_COLS)
+    parser.add_argument("--headless", action="store_true",
+                        help="generate and solve without a window, printing JSON statistics")
+    headless = parser.add_argument_group("headless mode")
+    headless.add_argument("--seed", type=int, help="seed for a reproducible maze")
+    headless.add_argument("--generator", choices=Maze.GENERATORS, default="backtracker")
+    headless.add_argument("--algorithm", choices=[*ALGORITHMS, "all"], default="bfs")
+    headless.add_argument("--start", type=parse_position, metavar="ROW,COL",
+                          help="start cell (default: top-left corner)")
+    headless.add_argument("--end", type=parse_position, metavar="ROW,COL",
+                          help="end cell (default: bottom-right corner)")
+    headless.add_argument("--output", metavar="FILE",
+                          help="also write the maze walls and the paths to a JSON file")
+    return parser
 
 
-def main():
+def run_headless(args, parser):
+    """Generate and solve a maze, print the statistics as JSON and return the exit status"""
+    start = args.start or (0, 0)
+    end = args.end or (args.rows - 1, args.cols - 1)
+    for name, (row, col) in (("--start", start), ("--end", end)):
+        if not (0 <= row < args.rows and 0 <= col < args.cols):
+            parser.error(f"{name} {row},{col} is outside the {args.rows}x{args.cols} maze")
+
+    maze = Maze(args.rows, args.cols)
+    started = time.perf_counter_ns()
+    maze.generate_maze(args.seed, args.generator)
+    generate_ns = time.perf_counter_ns() - started
+
+    names = list(ALGORITHMS) if args.algorithm == "all" else [args.algorithm]
+    results = [ALGORITHMS[name](maze).solve(start, end) for name in names]
+
+    report = {
+        "rows": args.rows,
+        "cols": args.cols,
+        "seed": args.seed,
+        "generator": args.generator,
+        "start": list(start),
+        "end": list(end),
+        "generate_ms": generate_ns / 1e6,
+        "results": [result.to_dict() for result in results],
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        # Walls as one hex digit per cell (bit 1 top, 2 right, 4 bottom, 8 left)
+        maze_file = dict(report, walls=maze.walls.hex()[1::2],
+                         paths={result.algorithm: result.path for result in results})
+        with open(args.output, "w") as f:
+            json.dump(maze_file, f)
+    return 0
+
+
+def main(argv=None):
     """Main entry point for the application"""
-    visualizer = MazeVisualizer()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.rows < 2 or args.cols < 2:
+        parser.error("the maze needs at least 2 rows and 2 columns")
+    if args.headless:
+        return run_headless(args, parser)
+
+    from visualizer import MazeVisualizer
+    visualizer = MazeVisualizer(args.rows, args.cols)
     visualizer.run()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
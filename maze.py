@@ -1,15 +1,200 @@
 """
 Maze generation and rendering with modern styling
+
+The maze is stored as two flat byte arrays indexed by ``row * cols + col``:
+one 4-bit wall mask and one set of state flags per cell. ``Maze.grid`` and
+``MazeCell`` are thin views over that storage for code that prefers to work
+with cell objects.
 """
 
+import hashlib
 import pygame
 import random
+from array import array
+from itertools import accumulate
+from distance_field import DistanceField
+from junction_graph import JunctionGraph
+from tree_index import TreeIndex
 from constants import (WALL_COLOR, PATH_BG, YELLOW, VISITED_COLOR, 
-                      GREEN, RED, WHITE, DARK_GRAY, EXPLORING_COLOR)
+                      GREEN, RED, WHITE, MIN_CELL_SIZE,
+                      HEATMAP_NEAR_COLOR, HEATMAP_FAR_COLOR, HEATMAP_ALPHA)
+
+
+# Wall bits of a cell's mask
+WALL_TOP = 1
+WALL_RIGHT = 2
+WALL_BOTTOM = 4
+WALL_LEFT = 8
+ALL_WALLS = WALL_TOP | WALL_RIGHT | WALL_BOTTOM | WALL_LEFT
+
+WALL_BITS = {'top': WALL_TOP, 'right': WALL_RIGHT, 'bottom': WALL_BOTTOM, 'left': WALL_LEFT}
+
+# State flag bits
+FLAG_VISITED = 1       # visited during generation
+FLAG_PATH = 2          # on the final path
+FLAG_SEARCHED = 4      # expanded during search
+
+
+def _bit_table(mask):
+    """Build a bytes.translate table that clears the given bits"""
+    return bytes(value & ~mask for value in range(256))
+
+
+# Wall mask -> number of open sides
+_OPEN_SIDES = bytes(4 - bin(value & ALL_WALLS).count("1") for value in range(256))
+
+
+# Tile state offsets, added to a wall mask to form an atlas key
+TILE_DEFAULT = 0
+TILE_SEARCHED = 16
+TILE_PATH = 32
+
+# State flags -> tile state offset (the final path wins over searched)
+_TILE_STATE = bytes(TILE_PATH if value & FLAG_PATH
+                    else TILE_SEARCHED if value & FLAG_SEARCHED
+                    else TILE_DEFAULT for value in range(256))
+
+# Palette of the level-of-detail pixel buffer: one entry per tile state, then walls
+_PIXEL_PALETTE = [PATH_BG, VISITED_COLOR, YELLOW, WALL_COLOR]
+_PIXEL_WALL = 3
+
+# Atlas key -> pixel colour index for the three non-corner pixels of a cell's
+# 2x2 block: its top edge, its left edge and its interior
+_PIXEL_TOP = bytes(_PIXEL_WALL if key & WALL_TOP else key >> 4 for key in range(256))
+_PIXEL_LEFT = bytes(_PIXEL_WALL if key & WALL_LEFT else key >> 4 for key in range(256))
+_PIXEL_INSIDE = bytes(key >> 4 for key in range(256))
+
+# Distance field heat levels (DistanceField.heat) blended from near to far;
+# the last entry, for unreachable cells, is the transparent colour key
+_HEAT_PALETTE = [tuple(near + (far - near) * level // DistanceField.FARTHEST
+                       for near, far in zip(HEATMAP_NEAR_COLOR, HEATMAP_FAR_COLOR))
+                 for level in range(DistanceField.FARTHEST + 1)] + [(0, 0, 0)]
+
+
+class TileAtlas:
+    """Pre-rendered cell tiles keyed by (wall mask, state) plus marker sprites"""
+    
+    WALL_THICKNESS = 3
+    STATE_COLORS = {TILE_DEFAULT: PATH_BG, TILE_SEARCHED: VISITED_COLOR, TILE_PATH: YELLOW}
+    
+    _atlases = {}
+    
+    @classmethod
+    def for_cell_size(cls, cell_size):
+        """Get the shared atlas for a cell size, rendering it on first use"""
+        atlas = cls._atlases.get(cell_size)
+        if atlas is None:
+            atlas = cls._atlases[cell_size] = cls(cell_size)
+        return atlas
+    
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.tiles = [None] * (TILE_PATH + ALL_WALLS + 1)
+        for state, color in self.STATE_COLORS.items():
+            for walls in range(ALL_WALLS + 1):
+                self.tiles[state | walls] = self._render_tile(walls, color)
+        self._markers = {}
+    
+    def tile(self, walls, flags):
+        """Get the tile for a cell's wall mask and state flags"""
+        return self.tiles[walls | _TILE_STATE[flags]]
+    
+    def _render_tile(self, walls, color):
+        """Render one cell background with its walls
+        
+        Wall lines are centred on the cell edge and clipped to the tile, so
+        the halves drawn by two neighbouring tiles add up to a full line.
+        Corner posts close the gaps where a wall of a neighbour ends. Walls
+        get thinner at small zoom levels so cells stay visible.
+        """
+        size = self.cell_size
+        tile = pygame.Surface((size, size))
+        tile.fill(color)
+        
+        thickness = min(self.WALL_THICKNESS, max(1, size // 6))
+        post = (thickness + 1) // 2
+        if walls & WALL_TOP:
+            pygame.draw.line(tile, WALL_COLOR, (0, 0), (size, 0), thickness)
+        if walls & WALL_RIGHT:
+            pygame.draw.line(tile, WALL_COLOR, (size, 0), (size, size), thickness)
+        if walls & WALL_BOTTOM:
+            pygame.draw.line(tile, WALL_COLOR, (0, size), (size, size), thickness)
+        if walls & WALL_LEFT:
+            pygame.draw.line(tile, WALL_COLOR, (0, 0), (0, size), thickness)
+        
+        for x, y in ((0, 0), (size - 1, 0), (0, size - 1), (size - 1, size - 1)):
+            tile.fill(WALL_COLOR, (x, y, post, post))
+        return tile
+    
+    def marker(self, color):
+        """Get the cached start/end marker sprite for a colour"""
+        sprite = self._markers.get(color)
+        if sprite is None:
+            sprite = self._markers[color] = self._render_marker(color)
+        return sprite
+    
+    def _render_marker(self, color):
+        """Render a modern marker with an outer glow onto a transparent sprite"""
+        radius = max(self.cell_size // 2 - 3, 3)
+        glow_radius = radius + 4
+        extent = glow_radius + 4
+        sprite = pygame.Surface((extent * 2, extent * 2), pygame.SRCALPHA)
+        center = (extent, extent)
+        
+        # Draw outer glow effect
+        for i in range(3):
+            alpha = 255 - (i * 80)
+            current_radius = glow_radius + i * 2
+            glow_surf = pygame.Surface((current_radius * 2, current_radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(glow_surf, (*color, alpha // 3), 
+                             (current_radius, current_radius), current_radius)
+            sprite.blit(glow_surf, (extent - current_radius, extent - current_radius))
+        
+        # Draw main circle
+        pygame.draw.circle(sprite, color, center, radius)
+        pygame.draw.circle(sprite, WHITE, center, radius, 2)
+        
+        # Draw inner highlight
+        highlight_offset = radius // 3
+        pygame.draw.circle(sprite, WHITE, 
+                         (extent - highlight_offset, extent - highlight_offset), radius // 4)
+        return sprite
+
+
+class CellWalls:
+    """Dict-like view of a single cell's wall mask"""
+    
+    __slots__ = ('_maze', '_index')
+    
+    def __init__(self, maze, index):
+        self._maze = maze
+        self._index = index
+    
+    def __getitem__(self, direction):
+        return bool(self._maze.walls[self._index] & WALL_BITS[direction])
+    
+    def __setitem__(self, direction, closed):
+        mask = self._maze.walls[self._index]
+        if closed:
+            mask |= WALL_BITS[direction]
+        else:
+            mask &= ~WALL_BITS[direction]
+        self._maze.set_walls(self._index, mask)
+    
+    def __iter__(self):
+        return iter(WALL_BITS)
+    
+    def __len__(self):
+        return len(WALL_BITS)
+    
+    def items(self):
+        return [(direction, self[direction]) for direction in WALL_BITS]
 
 
 class MazeCell:
-    """Represents a single cell in the maze"""
+    """View of a single cell in the maze's flat storage"""
+    
+    __slots__ = ('maze', 'index', 'row', 'col')
     
     # Direction mappings
     DIRECTIONS = {
@@ -19,43 +204,119 @@ class MazeCell:
         'right': (0, 1, 'right', 'left'),
     }
     
-    def __init__(self, row, col):
+    def __init__(self, maze, row, col):
+        self.maze = maze
+        self.index = row * maze.cols + col
         self.row = row
         self.col = col
-        self.walls = {'top': True, 'right': True, 'bottom': True, 'left': True}
-        self.visited = False
-        self.is_path = False
-        self.is_visited_search = False
-        
+    
+    def __eq__(self, other):
+        return (isinstance(other, MazeCell) and other.maze is self.maze
+                and other.index == self.index)
+    
+    def __hash__(self):
+        return hash((id(self.maze), self.index))
+    
+    def __repr__(self):
+        return f"MazeCell({self.row}, {self.col})"
+    
+    @property
+    def walls(self):
+        return CellWalls(self.maze, self.index)
+    
+    @walls.setter
+    def walls(self, walls):
+        mask = 0
+        for direction, closed in walls.items():
+            if closed:
+                mask |= WALL_BITS[direction]
+        self.maze.set_walls(self.index, mask)
+    
+    def _get_flag(self, flag):
+        return bool(self.maze.flags[self.index] & flag)
+    
+    def _set_flag(self, flag, value):
+        if value:
+            self.maze.set_flag(self.row, self.col, flag)
+        else:
+            self.maze.clear_flag(self.row, self.col, flag)
+    
+    @property
+    def visited(self):
+        return self._get_flag(FLAG_VISITED)
+    
+    @visited.setter
+    def visited(self, value):
+        self._set_flag(FLAG_VISITED, value)
+    
+    @property
+    def is_path(self):
+        return self._get_flag(FLAG_PATH)
+    
+    @is_path.setter
+    def is_path(self, value):
+        self._set_flag(FLAG_PATH, value)
+    
+    @property
+    def is_visited_search(self):
+        return self._get_flag(FLAG_SEARCHED)
+    
+    @is_visited_search.setter
+    def is_visited_search(self, value):
+        self._set_flag(FLAG_SEARCHED, value)
+    
     def draw(self, screen, x, y, cell_size):
         """Draw the cell with its walls and state with modern colors"""
-        # Draw cell background based on state
-        if self.is_path:
-            # Final path - bright yellow
-            pygame.draw.rect(screen, YELLOW, (x, y, cell_size, cell_size))
-        elif self.is_visited_search:
-            # Visited during search - light blue
-            pygame.draw.rect(screen, VISITED_COLOR, (x, y, cell_size, cell_size))
-        else:
-            # Default white background
-            pygame.draw.rect(screen, PATH_BG, (x, y, cell_size, cell_size))
-        
-        # Draw walls
-        self._draw_walls(screen, x, y, cell_size)
+        tile = TileAtlas.for_cell_size(cell_size).tile(self.maze.walls[self.index],
+                                                       self.maze.flags[self.index])
+        screen.blit(tile, (x, y))
+
+
+class MazeRow:
+    """Sequence view of one maze row"""
     
-    def _draw_walls(self, screen, x, y, cell_size):
-        """Draw walls for this cell with modern styling"""
-        wall_thickness = 3
-        walls_coords = {
-            'top': ((x, y), (x + cell_size, y)),
-            'right': ((x + cell_size, y), (x + cell_size, y + cell_size)),
-            'bottom': ((x, y + cell_size), (x + cell_size, y + cell_size)),
-            'left': ((x, y), (x, y + cell_size)),
-        }
-        
-        for direction, (start, end) in walls_coords.items():
-            if self.walls[direction]:
-                pygame.draw.line(screen, WALL_COLOR, start, end, wall_thickness)
+    __slots__ = ('_maze', '_row')
+    
+    def __init__(self, maze, row):
+        self._maze = maze
+        self._row = row
+    
+    def __len__(self):
+        return self._maze.cols
+    
+    def __getitem__(self, col):
+        if col < 0:
+            col += self._maze.cols
+        if not 0 <= col < self._maze.cols:
+            raise IndexError("maze column out of range")
+        return MazeCell(self._maze, self._row, col)
+    
+    def __iter__(self):
+        for col in range(self._maze.cols):
+            yield MazeCell(self._maze, self._row, col)
+
+
+class MazeGrid:
+    """Nested-list compatible view of the maze, as in ``maze.grid[row][col]``"""
+    
+    __slots__ = ('_maze',)
+    
+    def __init__(self, maze):
+        self._maze = maze
+    
+    def __len__(self):
+        return self._maze.rows
+    
+    def __getitem__(self, row):
+        if row < 0:
+            row += self._maze.rows
+        if not 0 <= row < self._maze.rows:
+            raise IndexError("maze row out of range")
+        return MazeRow(self._maze, row)
+    
+    def __iter__(self):
+        for row in range(self._maze.rows):
+            yield MazeRow(self._maze, row)
 
 
 class Maze:
@@ -64,150 +325,581 @@ class Maze:
     # Direction deltas for neighbor checking
     NEIGHBOR_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
     
-    def __init__(self, rows, cols):
+    # (row delta, col delta) -> (wall on the first cell, wall on the second)
+    WALL_BETWEEN = {
+        (1, 0): (WALL_BOTTOM, WALL_TOP),
+        (-1, 0): (WALL_TOP, WALL_BOTTOM),
+        (0, 1): (WALL_RIGHT, WALL_LEFT),
+        (0, -1): (WALL_LEFT, WALL_RIGHT),
+    }
+    
+    # Wall masks with exactly one open side
+    _DEAD_ENDS = frozenset(ALL_WALLS & ~wall for wall in (WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT))
+    
+    _CLEAR_VISITED = _bit_table(FLAG_VISITED)
+    
+    def __init__(self, rows, cols, walls=None):
+        """Create a maze with every wall closed, or over an existing wall buffer
+        
+        ``walls`` may be any writable buffer of at least rows * cols bytes,
+        e.g. shared memory, which is often rounded up to whole pages. Its
+        first rows * cols bytes are used as is, without copying.
+        """
         self.rows = rows
         self.cols = cols
-        self.grid = [[MazeCell(r, c) for c in range(cols)] for r in range(rows)]
+        self.size = rows * cols
+        if walls is None:
+            self.walls = bytearray([ALL_WALLS]) * self.size
+        else:
+            self.walls = memoryview(walls)[:self.size]
+        self.flags = bytearray(self.size)
+        self.grid = MazeGrid(self)
         self.start = None
         self.end = None
         
-    def generate_maze(self):
-        """Generate a maze using recursive backtracking algorithm"""
+        # Rendering invalidation: cell indices changed since the last draw,
+        # or a flag asking for the whole maze to be redrawn
+        self.dirty = []
+        self.full_redraw = True
+        
+        # Bumped whenever the wall structure changes
+        self.walls_version = 0
+        
+        # Digest of the wall bytes, and the walls_version it was computed for
+        self._walls_digest = None
+        self._walls_digest_version = None
+        
+        # Screen positions of the drawn cells, cached per offset, cell size
+        # and visible window
+        self._tile_positions = None
+        self._tile_positions_key = None
+        
+        # CSR adjacency index, and the walls_version it was built for
+        self._adjacency = None
+        self._adjacency_version = None
+        
+        # Tree index (None when the maze has loops), and its walls_version
+        self._tree_index = None
+        self._tree_index_version = None
+        
+        # Distance field of the last goal asked for, and its (walls_version, goal)
+        self._distance_field = None
+        self._distance_field_key = None
+        
+        # Corridor-contracted graph, and its walls_version
+        self._junction_graph = None
+        self._junction_graph_version = None
+        
+        # Per-cell search working arrays (algorithms.SearchState) shared by
+        # every algorithm solving this maze, by key
+        self.search_states = {}
+    
+    def restore_walls(self, walls):
+        """Replace the whole wall structure, e.g. from a saved trace"""
+        if len(walls) != self.size:
+            raise ValueError("wall data does not match the maze size")
+        self.walls[:] = walls
+        self.flags[:] = bytes(self.size)
+        self.walls_version += 1
+        self._invalidate()
+    
+    def index(self, row, col):
+        """Get the flat index of a (row, col) position"""
+        return row * self.cols + col
+    
+    def position(self, index):
+        """Get the (row, col) position of a flat index"""
+        return divmod(index, self.cols)
+        
+    # Maze generators accepted by generate_maze()
+    GENERATORS = ("backtracker", "braid")
+    
+    def generate_maze(self, seed=None, generator="backtracker"):
+        """Generate a maze using recursive backtracking algorithm
+        
+        The same seed always gives the same maze; without one the maze is
+        random. The "braid" generator then opens up every dead end, which
+        turns the perfect maze into one with loops and many routes.
+        """
+        if generator not in self.GENERATORS:
+            raise ValueError(f"unknown maze generator: {generator}")
+        rng = random.Random(seed) if seed is not None else random
         self._reset_maze()
-        self._recursive_backtrack()
+        self._recursive_backtrack(rng)
+        if generator == "braid":
+            self._braid(rng)
+        self.walls_version += 1
     
     def _reset_maze(self):
         """Reset all cells to initial state"""
-        for row in self.grid:
-            for cell in row:
-                cell.walls = {'top': True, 'right': True, 'bottom': True, 'left': True}
-                cell.visited = False
-                cell.is_path = False
-                cell.is_visited_search = False
-    
-    def _recursive_backtrack(self):
+        self.walls[:] = bytearray([ALL_WALLS]) * self.size
+        self.flags[:] = bytes(self.size)
+        self.walls_version += 1
+        self._invalidate()
+    
+    def _recursive_backtrack(self, rng=random):
         """Generate maze using recursive backtracking algorithm"""
-        stack = []
-        current = self.grid[0][0]
-        current.visited = True
-        stack.append(current)
+        flags = self.flags
+        stack = [0]
+        flags[0] |= FLAG_VISITED
         
         while stack:
             current = stack[-1]
             neighbors = self._get_unvisited_neighbors(current)
             
             if neighbors:
-                next_cell = random.choice(neighbors)
-                self._remove_wall(current, next_cell)
-                next_cell.visited = True
-                stack.append(next_cell)
+                next_index = rng.choice(neighbors)
+                self._remove_wall(current, next_index)
+                flags[next_index] |= FLAG_VISITED
+                stack.append(next_index)
             else:
                 stack.pop()
         
         # Reset visited flags for pathfinding
         self._reset_visited_flags()
     
+    def _braid(self, rng):
+        """Remove dead ends by knocking down one more wall of each
+        
+        A dead end joins a neighbouring dead end where it can, so each
+        removed wall clears two dead ends at once.
+        """
+        walls = self.walls
+        cols = self.cols
+        for index in range(self.size):
+            if walls[index] not in self._DEAD_ENDS:
+                continue
+            row, col = divmod(index, cols)
+            closed = []
+            for (dr, dc), (wall, _) in self.WALL_BETWEEN.items():
+                r, c = row + dr, col + dc
+                if walls[index] & wall and 0 <= r < self.rows and 0 <= c < cols:
+                    closed.append(r * cols + c)
+            if not closed:
+                continue
+            dead_ends = [neighbor for neighbor in closed if walls[neighbor] in self._DEAD_ENDS]
+            self._remove_wall(index, rng.choice(dead_ends or closed))
+    
     def _reset_visited_flags(self):
         """Reset visited flags after maze generation"""
-        for row in self.grid:
-            for cell in row:
-                cell.visited = False
+        self.flags[:] = self.flags.translate(self._CLEAR_VISITED)
     
-    def _get_unvisited_neighbors(self, cell):
-        """Get unvisited neighboring cells"""
+    def _get_unvisited_neighbors(self, index):
+        """Get indices of unvisited neighboring cells"""
+        flags = self.flags
+        cols = self.cols
+        row, col = divmod(index, cols)
         neighbors = []
         
-        for dr, dc in self.NEIGHBOR_DIRECTIONS:
-            new_row, new_col = cell.row + dr, cell.col + dc
-            if 0 <= new_row < self.rows and 0 <= new_col < self.cols:
-                neighbor = self.grid[new_row][new_col]
-                if not neighbor.visited:
-                    neighbors.append(neighbor)
+        if row > 0 and not flags[index - cols] & FLAG_VISITED:
+            neighbors.append(index - cols)
+        if row < self.rows - 1 and not flags[index + cols] & FLAG_VISITED:
+            neighbors.append(index + cols)
+        if col > 0 and not flags[index - 1] & FLAG_VISITED:
+            neighbors.append(index - 1)
+        if col < cols - 1 and not flags[index + 1] & FLAG_VISITED:
+            neighbors.append(index + 1)
         
         return neighbors
     
-    def _remove_wall(self, cell1, cell2):
+    def _remove_wall(self, index1, index2):
         """Remove wall between two adjacent cells"""
-        dr = cell2.row - cell1.row
-        dc = cell2.col - cell1.col
+        row1, col1 = divmod(index1, self.cols)
+        row2, col2 = divmod(index2, self.cols)
         
-        wall_map = {
-            (1, 0): ('bottom', 'top'),
-            (-1, 0): ('top', 'bottom'),
-            (0, 1): ('right', 'left'),
-            (0, -1): ('left', 'right'),
-        }
+        walls = self.WALL_BETWEEN.get((row2 - row1, col2 - col1))
+        if walls:
+            self.walls[index1] &= ~walls[0]
+            self.walls[index2] &= ~walls[1]
+    
+    def open_neighbors(self, index):
+        """Get indices of the cells reachable from a cell index"""
+        mask = self.walls[index]
+        cols = self.cols
+        col = index % cols
+        neighbors = []
+        
+        # Check top, bottom, left, right
+        if not mask & WALL_TOP and index >= cols:
+            neighbors.append(index - cols)
+        if not mask & WALL_BOTTOM and index + cols < self.size:
+            neighbors.append(index + cols)
+        if not mask & WALL_LEFT and col > 0:
+            neighbors.append(index - 1)
+        if not mask & WALL_RIGHT and col < cols - 1:
+            neighbors.append(index + 1)
+        
+        return neighbors
+    
+    def adjacency(self):
+        """Get the maze graph as a CSR index: (offsets, neighbors) int arrays
         
-        if (dr, dc) in wall_map:
-            wall1, wall2 = wall_map[(dr, dc)]
-            cell1.walls[wall1] = False
-            cell2.walls[wall2] = False
+        The cells reachable from cell i are
+        ``neighbors[offsets[i]:offsets[i + 1]]``, in the same order as
+        open_neighbors() gives them. The index is built on first use and
+        again after the walls change, so a search expands a cell with one
+        slice instead of decoding its wall mask.
+        """
+        if self._adjacency_version != self.walls_version:
+            self._adjacency = self._build_adjacency()
+            self._adjacency_version = self.walls_version
+        return self._adjacency
+    
+    def use_adjacency(self, offsets, neighbors):
+        """Take a CSR index built elsewhere for the current walls, e.g. in shared memory
+        
+        It is used like one built by adjacency() until the walls change.
+        """
+        self._adjacency = offsets, neighbors
+        self._adjacency_version = self.walls_version
+    
+    @property
+    def walls_digest(self):
+        """Content digest of the wall structure
+        
+        Mazes with the same walls get the same digest, however they got
+        them. It is a 128-bit BLAKE2b of the wall bytes, computed at C speed
+        (a few milliseconds per million cells) on first use after the walls
+        change.
+        """
+        if self._walls_digest_version != self.walls_version:
+            self._walls_digest = hashlib.blake2b(self.walls, digest_size=16).digest()
+            self._walls_digest_version = self.walls_version
+        return self._walls_digest
+    
+    def tree_index(self):
+        """Get a TreeIndex answering path queries without a search, or None
+        
+        Only a perfect maze (one path between any two cells) has one. Like
+        the adjacency index, it is built on first use after the walls change.
+        """
+        if self._tree_index_version != self.walls_version:
+            self._tree_index = TreeIndex.build(self)
+            self._tree_index_version = self.walls_version
+        return self._tree_index
+    
+    def distance_field(self, goal):
+        """Get the DistanceField of a goal cell index
+        
+        The field of the last goal is kept until the walls change, so any
+        number of starts can be routed to the same goal after one search.
+        """
+        key = (self.walls_version, goal)
+        if self._distance_field_key != key:
+            self._distance_field = DistanceField(self, goal)
+            self._distance_field_key = key
+        return self._distance_field
+    
+    def junction_graph(self):
+        """Get the maze graph with its corridors contracted into weighted edges
+        
+        Built on first use after the walls change, like the adjacency index.
+        """
+        if self._junction_graph_version != self.walls_version:
+            self._junction_graph = JunctionGraph(self)
+            self._junction_graph_version = self.walls_version
+        return self._junction_graph
+    
+    def _build_adjacency(self):
+        """Build the CSR adjacency index from the wall masks"""
+        cols = self.cols
+        masks = bytearray(self.walls)
+        
+        # Close the outer edges, which open_neighbors() checks by position
+        masks[:cols] = bytes(mask | WALL_TOP for mask in masks[:cols])
+        masks[-cols:] = bytes(mask | WALL_BOTTOM for mask in masks[-cols:])
+        masks[::cols] = bytes(mask | WALL_LEFT for mask in masks[::cols])
+        masks[cols - 1::cols] = bytes(mask | WALL_RIGHT for mask in masks[cols - 1::cols])
+        
+        # Index offsets through the open sides of each wall mask
+        sides = ((WALL_TOP, -cols), (WALL_BOTTOM, cols), (WALL_LEFT, -1), (WALL_RIGHT, 1))
+        deltas = [tuple(delta for wall, delta in sides if not mask & wall) for mask in range(16)]
+        
+        offsets = array('i', [0])
+        offsets.extend(accumulate(masks.translate(_OPEN_SIDES)))
+        neighbors = array('i', [index + delta
+                                for index, mask in enumerate(masks) for delta in deltas[mask]])
+        return offsets, neighbors
     
     def get_neighbors_pathfinding(self, cell):
         """Get accessible neighboring cells for pathfinding"""
-        neighbors = []
+        return [MazeCell(self, *divmod(index, self.cols))
+                for index in self.open_neighbors(cell.index)]
+    
+    def set_walls(self, index, mask):
+        """Replace the wall mask of the cell at a flat index"""
+        if self.walls[index] != mask:
+            self.walls[index] = mask
+            self.walls_version += 1
+            self.dirty.append(index)
+    
+    def set_flag(self, row, col, flag):
+        """Set a state flag on the cell at (row, col)"""
+        index = row * self.cols + col
+        if not self.flags[index] & flag:
+            self.flags[index] |= flag
+            self.dirty.append(index)
+    
+    def clear_flag(self, row, col, flag):
+        """Clear a state flag on the cell at (row, col)"""
+        index = row * self.cols + col
+        if self.flags[index] & flag:
+            self.flags[index] &= ~flag
+            self.dirty.append(index)
+    
+    def _invalidate(self):
+        """Mark the whole maze for redrawing"""
+        self.dirty.clear()
+        self.full_redraw = True
+    
+    def visible_window(self, offset_x, offset_y, cell_size, view=None):
+        """Get the (first_row, end_row, first_col, end_col) range of cells inside a screen rect
         
-        # Check top
-        if not cell.walls['top'] and cell.row > 0:
-            neighbors.append(self.grid[cell.row - 1][cell.col])
-        # Check bottom
-        if not cell.walls['bottom'] and cell.row < self.rows - 1:
-            neighbors.append(self.grid[cell.row + 1][cell.col])
-        # Check left
-        if not cell.walls['left'] and cell.col > 0:
-            neighbors.append(self.grid[cell.row][cell.col - 1])
-        # Check right
-        if not cell.walls['right'] and cell.col < self.cols - 1:
-            neighbors.append(self.grid[cell.row][cell.col + 1])
+        ``offset_x``/``offset_y`` is the screen position of cell (0, 0). It
+        lies outside ``view`` when the maze is panned, and without a view the
+        whole maze is visible.
+        """
+        if view is None:
+            return 0, self.rows, 0, self.cols
+        return (max(int((view.top - offset_y) // cell_size), 0),
+                min(int(-(-(view.bottom - offset_y) // cell_size)), self.rows),
+                max(int((view.left - offset_x) // cell_size), 0),
+                min(int(-(-(view.right - offset_x) // cell_size)), self.cols))
+    
+    def draw(self, screen, offset_x, offset_y, cell_size, view=None):
+        """Draw the maze, or only the cells inside the ``view`` screen rect
         
-        return neighbors
+        Cells outside the view are never touched, so the cost depends on the
+        size of the view rather than the size of the maze. Below
+        MIN_CELL_SIZE pixels per cell, tiles give way to _draw_pixels.
+        """
+        self.dirty.clear()
+        self.full_redraw = False
+        if cell_size < MIN_CELL_SIZE:
+            self._draw_pixels(screen, offset_x, offset_y, cell_size, view)
+            return
+        
+        first_row, end_row, first_col, end_col = window = self.visible_window(
+            offset_x, offset_y, cell_size, view)
+        if first_row >= end_row or first_col >= end_col:
+            return
+        
+        # Gather the visible rows of both byte arrays, then build every atlas
+        # key (wall mask | tile state) by OR-ing them as big integers
+        cols = self.cols
+        if end_col - first_col == cols:
+            walls = self.walls[first_row * cols:end_row * cols]
+            flags = self.flags[first_row * cols:end_row * cols]
+        else:
+            rows = range(first_row * cols + first_col, end_row * cols, cols)
+            width = end_col - first_col
+            walls = b"".join([self.walls[i:i + width] for i in rows])
+            flags = b"".join([self.flags[i:i + width] for i in rows])
+        states = flags.translate(_TILE_STATE)
+        keys = (int.from_bytes(walls, 'little')
+                | int.from_bytes(states, 'little')).to_bytes(len(walls), 'little')
+        
+        atlas = TileAtlas.for_cell_size(cell_size)
+        positions = self._get_tile_positions(offset_x, offset_y, cell_size, window)
+        previous_clip = screen.get_clip()
+        clip = self._clip_rect(offset_x, offset_y, cell_size, view)
+        screen.set_clip(clip.clip(previous_clip))
+        screen.blits(zip(map(atlas.tiles.__getitem__, keys), positions), doreturn=False)
+        
+        # Draw start point (green circle) and end point (red circle)
+        for position, color in ((self.start, GREEN), (self.end, RED)):
+            if position:
+                self._draw_marker(screen, position, offset_x, offset_y, cell_size, color)
+        screen.set_clip(previous_clip)
     
-    def draw(self, screen, offset_x, offset_y, cell_size):
-        """Draw the entire maze"""
-        for row in self.grid:
-            for cell in row:
-                x = offset_x + cell.col * cell_size
-                y = offset_y + cell.row * cell_size
-                cell.draw(screen, x, y, cell_size)
+    def draw_dirty(self, screen, offset_x, offset_y, cell_size, view=None):
+        """Redraw only the cells changed since the last draw
+        
+        Changed cells outside the view are skipped. Returns the list of
+        screen rects that were touched, ready for pygame.display.update().
+        """
+        clip = self._clip_rect(offset_x, offset_y, cell_size, view)
+        if not self.full_redraw and not self.dirty:
+            return []
+        if self.full_redraw or cell_size < MIN_CELL_SIZE:
+            # The pixel buffer redraws the whole view in a few milliseconds
+            self.draw(screen, offset_x, offset_y, cell_size, view)
+            return [clip]
+        
+        cols = self.cols
+        first_row, end_row, first_col, end_col = self.visible_window(
+            offset_x, offset_y, cell_size, view)
+        dirty = set(self.dirty)
+        self.dirty.clear()
         
-        # Draw start point (green circle)
-        if self.start:
-            self._draw_marker(screen, self.start, offset_x, offset_y, cell_size, GREEN)
+        # Markers blend a translucent glow over their neighbours, so a change
+        # next to one repaints the block under it before redrawing the marker
+        atlas = TileAtlas.for_cell_size(cell_size)
+        reach = self._marker_reach(atlas)
+        markers = []
+        for position, color in ((self.start, GREEN), (self.end, RED)):
+            if not position:
+                continue
+            row, col = position
+            block = [r * cols + c
+                     for r in range(max(row - reach, 0), min(row + reach + 1, self.rows))
+                     for c in range(max(col - reach, 0), min(col + reach + 1, cols))]
+            if not dirty.isdisjoint(block):
+                markers.append((position, color))
+                dirty.update(block)
         
-        # Draw end point (red circle)
-        if self.end:
-            self._draw_marker(screen, self.end, offset_x, offset_y, cell_size, RED)
+        walls = self.walls
+        flags = self.flags
+        blits = []
+        for index in dirty:
+            row, col = divmod(index, cols)
+            if first_row <= row < end_row and first_col <= col < end_col:
+                blits.append((atlas.tile(walls[index], flags[index]),
+                              (offset_x + col * cell_size, offset_y + row * cell_size)))
+        
+        # Only the cells under a marker's glow were repainted, so keep it
+        # (and cells cut by the view edge) off the border around the maze
+        previous_clip = screen.get_clip()
+        screen.set_clip(clip.clip(previous_clip))
+        rects = [rect.clip(clip) for rect in screen.blits(blits)]
+        for position, color in markers:
+            self._draw_marker(screen, position, offset_x, offset_y, cell_size, color)
+        screen.set_clip(previous_clip)
+        
+        return rects
     
-    def _draw_marker(self, screen, position, offset_x, offset_y, cell_size, color):
-        """Draw a modern marker (start or end point) on the maze"""
-        x = offset_x + position[1] * cell_size + cell_size // 2
-        y = offset_y + position[0] * cell_size + cell_size // 2
-        radius = cell_size // 2 - 3
+    def _draw_pixels(self, screen, offset_x, offset_y, cell_size, view):
+        """Level-of-detail drawing for zoom levels below MIN_CELL_SIZE
         
-        # Draw outer glow effect
-        glow_radius = radius + 4
-        glow_color = (*color[:3], 50) if len(color) == 3 else color
-        for i in range(3):
-            alpha = 255 - (i * 80)
-            current_radius = glow_radius + i * 2
-            glow_surf = pygame.Surface((current_radius * 2, current_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surf, (*color, alpha // 3), 
-                             (current_radius, current_radius), current_radius)
-            screen.blit(glow_surf, (x - current_radius, y - current_radius))
+        Each visible cell becomes a 2x2 block of an 8-bit palettized buffer:
+        a corner post, its top and left edges (wall or state colour) and its
+        interior. The buffer is built with byte translate and slice
+        operations, never per cell, and then scaled onto the view. When
+        there are more cells than pixels, only every ``step``-th row and
+        column is sampled, so the buffer stays about the size of the view.
+        """
+        step = max(1, int(-(-2 // cell_size)))
+        first_row, end_row, first_col, end_col = self.visible_window(
+            offset_x, offset_y, cell_size, view)
+        first_row -= first_row % step
+        first_col -= first_col % step
+        starts = range(first_row * self.cols + first_col, end_row * self.cols, step * self.cols)
+        if not starts or first_col >= end_col:
+            return
         
-        # Draw main circle
-        pygame.draw.circle(screen, color, (x, y), radius)
-        pygame.draw.circle(screen, WHITE, (x, y), radius, 2)
+        span = end_col - first_col
+        walls = b"".join([self.walls[i:i + span:step] for i in starts])
+        flags = b"".join([self.flags[i:i + span:step] for i in starts])
+        states = flags.translate(_TILE_STATE)
+        keys = (int.from_bytes(walls, 'little')
+                | int.from_bytes(states, 'little')).to_bytes(len(walls), 'little')
         
-        # Draw inner highlight
-        highlight_offset = radius // 3
-        pygame.draw.circle(screen, (255, 255, 255, 100), 
-                         (x - highlight_offset, y - highlight_offset), radius // 4)
+        # Interleave the pixel columns of each cell, then the two pixel rows
+        count = len(keys)
+        upper = bytearray(2 * count)
+        upper[0::2] = bytes([_PIXEL_WALL]) * count
+        upper[1::2] = keys.translate(_PIXEL_TOP)
+        lower = bytearray(2 * count)
+        lower[0::2] = keys.translate(_PIXEL_LEFT)
+        lower[1::2] = keys.translate(_PIXEL_INSIDE)
+        width = 2 * (count // len(starts))
+        pixels = b"".join([rows[i:i + width]
+                           for i in range(0, 2 * count, width) for rows in (upper, lower)])
+        image = pygame.image.frombuffer(pixels, (width, 2 * len(starts)), 'P')
+        image.set_palette(_PIXEL_PALETTE)
+        
+        # Scale the buffer to the screen area its sampled cells cover
+        left = round(offset_x + first_col * cell_size)
+        top = round(offset_y + first_row * cell_size)
+        right = round(offset_x + (first_col + width // 2 * step) * cell_size)
+        bottom = round(offset_y + (first_row + len(starts) * step) * cell_size)
+        image = pygame.transform.scale(image, (max(right - left, 1), max(bottom - top, 1)))
+        
+        previous_clip = screen.get_clip()
+        clip = self._clip_rect(offset_x, offset_y, cell_size, view)
+        screen.set_clip(clip.clip(previous_clip))
+        screen.blit(image, (left, top))
+        
+        # The buffer only has top and left walls; close the outer right and bottom edges
+        pygame.draw.rect(screen, WALL_COLOR, self._clip_rect(offset_x, offset_y, cell_size), 1)
+        for position, color in ((self.start, GREEN), (self.end, RED)):
+            if position:
+                self._draw_marker(screen, position, offset_x, offset_y, cell_size, color)
+        screen.set_clip(previous_clip)
+    
+    def draw_heatmap(self, screen, field, offset_x, offset_y, cell_size, view=None):
+        """Tint the visible cells by their distance in a DistanceField
+        
+        Like _draw_pixels, the heat bytes of the visible cells (sampled once
+        cells get smaller than a pixel) become an 8-bit image scaled onto
+        the view, here blended over the maze. The markers are drawn again
+        on top.
+        """
+        step = max(1, int(-(-1 // cell_size)))
+        first_row, end_row, first_col, end_col = self.visible_window(
+            offset_x, offset_y, cell_size, view)
+        first_row -= first_row % step
+        first_col -= first_col % step
+        starts = range(first_row * self.cols + first_col, end_row * self.cols, step * self.cols)
+        if not starts or first_col >= end_col:
+            return
+        
+        heat = field.heat
+        span = end_col - first_col
+        pixels = b"".join([heat[i:i + span:step] for i in starts])
+        width = len(pixels) // len(starts)
+        image = pygame.image.frombuffer(pixels, (width, len(starts)), 'P')
+        image.set_palette(_HEAT_PALETTE)
+        
+        left = round(offset_x + first_col * cell_size)
+        top = round(offset_y + first_row * cell_size)
+        right = round(offset_x + (first_col + width * step) * cell_size)
+        bottom = round(offset_y + (first_row + len(starts) * step) * cell_size)
+        image = pygame.transform.scale(image, (max(right - left, 1), max(bottom - top, 1)))
+        image.set_colorkey(DistanceField.UNREACHABLE)
+        image.set_alpha(HEATMAP_ALPHA)
+        
+        previous_clip = screen.get_clip()
+        clip = self._clip_rect(offset_x, offset_y, cell_size, view)
+        screen.set_clip(clip.clip(previous_clip))
+        screen.blit(image, (left, top))
+        for position, color in ((self.start, GREEN), (self.end, RED)):
+            if position:
+                self._draw_marker(screen, position, offset_x, offset_y, cell_size, color)
+        screen.set_clip(previous_clip)
+    
+    def _clip_rect(self, offset_x, offset_y, cell_size, view=None):
+        """Screen rect the maze may draw into: the maze area, cut to the view"""
+        left, top = round(offset_x), round(offset_y)
+        maze_rect = pygame.Rect(left, top, round(offset_x + self.cols * cell_size) - left,
+                                round(offset_y + self.rows * cell_size) - top)
+        return maze_rect if view is None else maze_rect.clip(view)
+    
+    @staticmethod
+    def _marker_reach(atlas):
+        """Number of cells a marker sprite's glow extends past its own cell"""
+        extent = atlas.marker(GREEN).get_width() // 2 - atlas.cell_size // 2
+        return max(1, -(-extent // atlas.cell_size))
+    
+    def _get_tile_positions(self, offset_x, offset_y, cell_size, window):
+        """Get the cached top-left screen position of every cell in a window"""
+        key = (offset_x, offset_y, cell_size, window)
+        if self._tile_positions_key != key:
+            first_row, end_row, first_col, end_col = window
+            xs = [offset_x + col * cell_size for col in range(first_col, end_col)]
+            self._tile_positions = [(x, offset_y + row * cell_size)
+                                    for row in range(first_row, end_row) for x in xs]
+            self._tile_positions_key = key
+        return self._tile_positions
+    
+    def _draw_marker(self, screen, position, offset_x, offset_y, cell_size, color):
+        """Draw a modern marker (start or end point) on the maze"""
+        x = round(offset_x + position[1] * cell_size + cell_size // 2)
+        y = round(offset_y + position[0] * cell_size + cell_size // 2)
+        sprite = TileAtlas.for_cell_size(max(cell_size, MIN_CELL_SIZE)).marker(color)
+        screen.blit(sprite, sprite.get_rect(center=(x, y)))
     
     def clear_path(self):
         """Clear pathfinding visualization"""
-        for row in self.grid:
-            for cell in row:
-                cell.is_path = False
-                cell.is_visited_search = False
-                cell.visited = False
\ No newline at end of file
+        self.flags[:] = bytes(self.size)
+        self._invalidate()
\ No newline at end of file
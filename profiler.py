@@ -0,0 +1,138 @@
+"""
+Frame-time instrumentation: per-phase frame timings with rolling percentiles,
+and on-demand cProfile + tracemalloc captures of a number of frames
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from collections import deque
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sequence, e.g. fraction=0.99 for p99"""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class FrameProfiler:
+    """Splits each frame into named phases, lap by lap
+
+    lap(phase) charges the time since the previous lap to a phase, so
+    instrumenting code is one call after each section. end_frame() closes a
+    frame and keeps it in a rolling history. Time charged to the "wait" phase
+    (sleeping for input or frame pacing) is not counted as frame time.
+    """
+
+    WAIT = "wait"
+
+    def __init__(self, history=240):
+        self.frames = deque(maxlen=history)
+        self.enabled = False
+        self.capture = None
+        self._phases = {}
+        self._last = time.perf_counter_ns()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap to a phase of the current frame"""
+        now = time.perf_counter_ns()
+        self._phases[phase] = self._phases.get(phase, 0) + now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """Close the current frame and add it to the history"""
+        self.lap("other")
+        phases = self._phases
+        self._phases = {}
+        phases.pop(self.WAIT, None)
+        self.frames.append((sum(phases.values()), phases))
+        if self.capture and self.capture.frame_done():
+            self.capture = None
+
+    def frame_times_ms(self):
+        return [total / 1e6 for total, _ in self.frames]
+
+    def phase_means_ms(self):
+        """Mean time per frame of every phase over the history, slowest first"""
+        totals = {}
+        for _, phases in self.frames:
+            for phase, elapsed in phases.items():
+                totals[phase] = totals.get(phase, 0) + elapsed
+        count = max(len(self.frames), 1)
+        return sorted(((phase, total / count / 1e6) for phase, total in totals.items()),
+                      key=lambda item: item[1], reverse=True)
+
+    def summary_lines(self):
+        """Text lines for the HUD: frame time percentiles and the phase breakdown"""
+        times = self.frame_times_ms()
+        last = times[-1] if times else 0
+        lines = [f"frame {last:.2f}ms  p50 {percentile(times, 0.5):.2f}  p99 {percentile(times, 0.99):.2f}"]
+        phases = [f"{phase} {mean:.2f}" for phase, mean in self.phase_means_ms()]
+        for i in range(0, len(phases), 3):
+            lines.append("  ".join(phases[i:i + 3]))
+        if self.capture:
+            lines.append(f"capturing profile... {self.capture.remaining} frames left")
+        return lines
+
+    def start_capture(self, frames, prefix):
+        """Profile the next number of frames; returns the capture"""
+        if self.capture is None:
+            self.capture = ProfileCapture(frames, prefix)
+        return self.capture
+
+
+class ProfileCapture:
+    """cProfile and tracemalloc over a number of frames, written to files when done
+
+    ``<prefix>-<timestamp>.prof`` holds the raw cProfile stats (for pstats
+    or snakeviz) and ``<prefix>-<timestamp>.txt`` a readable report with the
+    top functions and the top allocation sites.
+    """
+
+    TOP_FUNCTIONS = 30
+    TOP_ALLOCATIONS = 20
+
+    def __init__(self, frames, prefix):
+        self.remaining = frames
+        self.frames = frames
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.stats_file = f"{prefix}-{stamp}.prof"
+        self.report_file = f"{prefix}-{stamp}.txt"
+        self.error = None
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def frame_done(self):
+        """Count one captured frame; returns True once the capture is written"""
+        self.remaining -= 1
+        if self.remaining > 0:
+            return False
+        self._profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        try:
+            self._write(snapshot)
+        except OSError as error:
+            self.error = error
+        return True
+
+    def _write(self, snapshot):
+        self._profile.dump_stats(self.stats_file)
+
+        report = io.StringIO()
+        report.write(f"Profile of {self.frames} frames\n\n")
+        stats = pstats.Stats(self._profile, stream=report)
+        stats.sort_stats("cumulative").print_stats(self.TOP_FUNCTIONS)
+        report.write("Top allocation sites\n\n")
+        for stat in snapshot.statistics("lineno")[:self.TOP_ALLOCATIONS]:
+            report.write(f"{stat}\n")
+        with open(self.report_file, "w") as f:
+            f.write(report.getvalue())
\ No newline at end of file
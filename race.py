@@ -0,0 +1,218 @@
+"""
+Race mode: several algorithms searching the same maze side by side
+
+The searches are recorded in parallel by a BatchSolver process pool, then
+replayed in lockstep in split panes, so every algorithm gets the same number
+of expanded nodes per frame and the first to reach the end wins.
+"""
+
+import math
+import os
+import pygame
+from constants import *
+from batch import BatchSolver
+from camera import Camera
+from maze import Maze
+from search_trace import TracePlayer
+from ui_components import fonts
+
+
+class RaceLane:
+    """One racing algorithm: its trace replayed on its own pane"""
+
+    def __init__(self, label, trace, maze, view):
+        self.label = label
+        self.trace = trace
+        self.result = trace.result
+        self.maze = maze
+        self.camera = Camera(view, maze.rows, maze.cols)
+        self.player = TracePlayer(maze, trace)
+        self.place = None
+
+    @property
+    def finished(self):
+        """Whether the replay reached the end cell (or gave up)"""
+        return self.player.position >= len(self.trace.visits)
+
+
+class Race:
+    """Records searches in parallel, then replays them in lockstep
+
+    Until ``ready``, poll() collects the traces as the workers finish them.
+    Afterwards the race plays back with the same seek/advance/playing
+    interface as a TracePlayer, one timeline position for every lane. Each
+    lane draws into its own pane of ``view`` through its own Maze, which
+    shares the wall buffer of the maze being raced on. The workers read the
+    maze's adjacency index from shared memory, built at most once per wall
+    change; each still builds the tree or junction index its algorithm
+    needs.
+    """
+
+    def __init__(self, maze, algorithms, view, workers=None):
+        """Start recording; ``algorithms`` is a list of (label, algorithm) pairs"""
+        self.maze = maze
+        self.labels = [label for label, _ in algorithms]
+        self.view = pygame.Rect(view)
+        self.lanes = []
+        self.position = 0
+        self.playing = True
+        self._traces = {}
+
+        workers = workers or min(len(algorithms), os.cpu_count() or 1)
+        self._solver = BatchSolver(maze, workers, chunk_size=1)
+        queries = [(maze.start, maze.end, algorithm.name) for _, algorithm in algorithms]
+        self._futures = self._solver.submit(queries, trace=True)
+
+    @property
+    def ready(self):
+        return bool(self.lanes)
+
+    def poll(self):
+        """Collect finished traces; returns True once every lane is ready to play"""
+        if self.ready or self._solver is None:
+            return self.ready
+        for future in self._futures:
+            if future.done():
+                self._traces.update(future.result())
+        if len(self._traces) < len(self.labels):
+            return False
+
+        self.close()
+        for number, (label, view) in enumerate(zip(self.labels, self._pane_views())):
+            maze = Maze(self.maze.rows, self.maze.cols, walls=self.maze.walls)
+            maze.start = self.maze.start
+            maze.end = self.maze.end
+            self.lanes.append(RaceLane(label, self._traces[number], maze, view))
+        self._rank_lanes()
+        return True
+
+    def close(self):
+        """Stop the workers, dropping any search not recorded yet"""
+        if self._solver is not None:
+            self._solver.close(cancel=True)
+            self._solver = None
+
+    def _pane_views(self):
+        """Camera views of the panes: a grid of two columns below each pane's header"""
+        count = len(self.labels)
+        columns = 1 if count == 1 else 2
+        rows = math.ceil(count / columns)
+        gap = RACE_PANE_GAP
+        width = (self.view.width - gap * (columns - 1)) // columns
+        height = (self.view.height - gap * (rows - 1)) // rows
+        views = []
+        for number in range(count):
+            row, column = divmod(number, columns)
+            views.append(pygame.Rect(self.view.x + column * (width + gap),
+                                     self.view.y + row * (height + gap) + RACE_HEADER_HEIGHT,
+                                     width, height - RACE_HEADER_HEIGHT))
+        return views
+
+    def _rank_lanes(self):
+        """Finishing places: fewest expanded nodes to reach the end first"""
+        finishers = sorted((lane for lane in self.lanes if lane.result.found),
+                           key=lambda lane: lane.result.nodes_expanded)
+        for lane in finishers:
+            lane.place = 1 + sum(other.result.nodes_expanded < lane.result.nodes_expanded
+                                 for other in finishers)
+
+    def standings(self):
+        """Lanes in finishing order, those that found no path last"""
+        return sorted(self.lanes, key=lambda lane: lane.place or math.inf)
+
+    # Playback, in step with every lane
+
+    def __len__(self):
+        return max((len(lane.trace) for lane in self.lanes), default=0)
+
+    def __bool__(self):
+        # Still true while recording, when the timeline is empty
+        return True
+
+    @property
+    def at_end(self):
+        return self.position >= len(self)
+
+    @property
+    def nodes_visited(self):
+        """Expanded nodes shown at the current position, over all lanes"""
+        return sum(lane.player.nodes_visited for lane in self.lanes)
+
+    @property
+    def path_length(self):
+        """Longest path shown at the current position"""
+        return max((lane.player.path_length for lane in self.lanes), default=0)
+
+    def seek(self, position):
+        """Move every lane's playhead to the same timeline position"""
+        self.position = min(max(position, 0), len(self))
+        for lane in self.lanes:
+            lane.player.seek(self.position)
+
+    def advance(self, steps):
+        """Play every lane forward by the same number of steps"""
+        self.seek(self.position + steps)
+        if self.at_end:
+            self.playing = False
+
+    # Viewing: the panes zoom and pan together
+
+    def zoom(self, steps, pos):
+        """Zoom every pane around the point matching ``pos`` in the pane under it"""
+        lane = self._lane_at(pos)
+        if lane is None:
+            return False
+        dx = pos[0] - lane.camera.view.x
+        dy = pos[1] - lane.camera.view.y
+        return any([other.camera.zoom(steps, (other.camera.view.x + dx, other.camera.view.y + dy))
+                    for other in self.lanes])
+
+    def pan(self, dx, dy):
+        return any([lane.camera.pan(dx, dy) for lane in self.lanes])
+
+    def fit(self):
+        for lane in self.lanes:
+            lane.camera.fit()
+
+    def screen_to_cell(self, pos):
+        """Get the (row, col) under a screen position in any pane"""
+        lane = self._lane_at(pos)
+        return lane.camera.screen_to_cell(pos) if lane else None
+
+    def _lane_at(self, pos):
+        for lane in self.lanes:
+            if lane.camera.view.collidepoint(pos):
+                return lane
+        return None
+
+    def draw(self, screen):
+        """Draw every pane in full"""
+        for lane in self.lanes:
+            camera = lane.camera
+            lane.maze.draw(screen, *camera.origin, camera.cell_size, camera.view)
+            self._draw_header(screen, lane)
+
+    def draw_dirty(self, screen):
+        """Redraw the changed cells of every pane and the live headers
+
+        Returns the touched screen rects, for pygame.display.update().
+        """
+        rects = []
+        for lane in self.lanes:
+            camera = lane.camera
+            rects += lane.maze.draw_dirty(screen, *camera.origin, camera.cell_size, camera.view)
+            rects.append(self._draw_header(screen, lane))
+        return rects
+
+    def _draw_header(self, screen, lane):
+        """Draw a pane's title bar with its live counters; returns its rect"""
+        view = lane.camera.view
+        rect = pygame.Rect(view.x, view.y - RACE_HEADER_HEIGHT, view.width, RACE_HEADER_HEIGHT)
+        pygame.draw.rect(screen, PANEL_BG, rect)
+        player = lane.player
+        text = f"{lane.label}   {player.nodes_visited} visited   {player.path_length} path"
+        if lane.finished:
+            text += f"   #{lane.place}" if lane.place else "   no path"
+        font = fonts.get(18)
+        screen.blit(font.render(text, True, DARK_GRAY), (rect.x + 4, rect.y + 3))
+        return rect
\ No newline at end of file
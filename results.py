@@ -0,0 +1,84 @@
+"""
+Structured search results with exact counters, exportable as JSON or CSV
+"""
+
+import csv
+import json
+import os
+
+
+class SolveResult:
+    """Outcome and counters of one search
+
+    The search keeps the counters up to date while it runs, so reading them
+    never needs a scan over the maze. ``compute_ns`` is the time spent
+    inside the search itself; ``render_ns`` is whatever the caller spent
+    applying, recording and drawing its events.
+    """
+
+    FIELDS = ("algorithm", "found", "path_length", "nodes_expanded", "nodes_generated",
+              "peak_frontier", "open_set_size", "heap_pushes", "heap_pops",
+              "compute_ms", "render_ms")
+
+    def __init__(self, algorithm=""):
+        self.algorithm = algorithm
+        self.path = None
+        # Length of a path dropped by drop_path()
+        self._path_length = None
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.peak_frontier = 0
+        self.open_set_size = 0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.compute_ns = 0
+        self.render_ns = 0
+
+    @property
+    def found(self):
+        return self.path is not None or self._path_length is not None
+
+    @property
+    def path_length(self):
+        """Number of cells on the path, start and end included"""
+        if self.path:
+            return len(self.path)
+        return self._path_length or 0
+
+    def drop_path(self):
+        """Let go of the path, keeping found and path_length, e.g. before sending the result on"""
+        if self.path is not None:
+            self._path_length = len(self.path)
+            self.path = None
+
+    @property
+    def compute_ms(self):
+        return self.compute_ns / 1e6
+
+    @property
+    def render_ms(self):
+        return self.render_ns / 1e6
+
+    def to_dict(self):
+        """The exported fields as a flat dict (the path itself is left out)"""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self):
+        return (f"SolveResult({self.algorithm!r}, path_length={self.path_length}, "
+                f"nodes_expanded={self.nodes_expanded}, compute_ms={self.compute_ms:.3f})")
+
+
+def write_json(results, filename):
+    """Write a list of results to a JSON file"""
+    with open(filename, "w") as f:
+        json.dump([result.to_dict() for result in results], f, indent=2)
+
+
+def append_csv(results, filename):
+    """Append results to a CSV file, writing the header row if the file is new"""
+    new_file = not os.path.exists(filename) or os.path.getsize(filename) == 0
+    with open(filename, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SolveResult.FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerows(result.to_dict() for result in results)
\ No newline at end of file
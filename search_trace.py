@@ -0,0 +1,229 @@
+"""
+Compact search traces: record a search once, replay or scrub it any number
+of times without re-running the algorithm, and save/load it to disk
+"""
+
+import struct
+import sys
+from array import array
+from algorithms import VISIT, ENQUEUE, PATH
+from maze import FLAG_PATH, FLAG_SEARCHED
+from results import SolveResult
+
+
+class SearchTrace:
+    """Visit order, parent links and final path of one search, as flat int arrays
+
+    ``visits`` holds expanded cell indices in order, ``parents`` the index
+    each cell was reached from (-1 if never reached, or for the start) and
+    ``path`` the final path from start to end. The maze walls are kept too,
+    so a loaded trace can restore the maze it was recorded on, along with
+    the search's SolveResult counters.
+    """
+
+    MAGIC = b"MZTR"
+    VERSION = 2
+    HEADER = struct.Struct("<4sHIIiiiiIIIIIIIQQHH")
+
+    def __init__(self, rows, cols, walls, start, end, algorithm=""):
+        self.rows = rows
+        self.cols = cols
+        self.walls = bytes(walls)
+        self.start = start
+        self.end = end
+        self.algorithm = algorithm
+        self.result = SolveResult()
+        self.visits = array('i')
+        self.parents = array('i', [-1]) * (rows * cols)
+        self.path = array('i')
+        self._last_visit = -1
+
+    @classmethod
+    def for_maze(cls, maze, start=None, end=None, algorithm=""):
+        """Create an empty trace bound to a maze's current walls and markers"""
+        start = maze.start if start is None else start
+        end = maze.end if end is None else end
+        return cls(maze.rows, maze.cols, maze.walls, start, end, algorithm)
+
+    @classmethod
+    def capture(cls, maze, algorithm, start=None, end=None, name=""):
+        """Run a search to completion at full speed and return its trace"""
+        trace = cls.for_maze(maze, start, end, name)
+        trace.result = SolveResult(algorithm.name)
+        for event in algorithm.steps(trace.start, trace.end, trace.result):
+            trace.record(event)
+        return trace
+
+    def record(self, event):
+        """Record one step event
+
+        Cells are enqueued while the most recent visit is being expanded,
+        so that visit is their parent.
+        """
+        kind, row, col = event
+        index = row * self.cols + col
+        if kind == VISIT:
+            self.visits.append(index)
+            self._last_visit = index
+        elif kind == ENQUEUE:
+            self.parents[index] = self._last_visit
+        elif kind == PATH:
+            self.path.append(index)
+
+    def __len__(self):
+        """Number of timeline steps: every visit, then every path cell"""
+        return len(self.visits) + len(self.path)
+
+    def save(self, filename):
+        """Write the trace to a binary file"""
+        result = self.result
+        name = self.algorithm.encode("utf-8")
+        result_name = result.algorithm.encode("utf-8")
+        start = self.start or (-1, -1)
+        end = self.end or (-1, -1)
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, self.rows, self.cols,
+                                  start[0], start[1], end[0], end[1],
+                                  len(self.visits), len(self.path),
+                                  result.nodes_generated, result.peak_frontier, result.open_set_size,
+                                  result.heap_pushes, result.heap_pops,
+                                  result.compute_ns, result.render_ns, len(name), len(result_name))
+        with open(filename, "wb") as f:
+            f.write(header)
+            f.write(name)
+            f.write(result_name)
+            f.write(self.walls)
+            for values in (self.visits, self.parents, self.path):
+                f.write(_to_little_endian(values).tobytes())
+
+    @classmethod
+    def load(cls, filename):
+        """Read a trace written by save()"""
+        with open(filename, "rb") as f:
+            data = f.read()
+
+        try:
+            (magic, version, rows, cols, start_row, start_col, end_row, end_col,
+             visit_count, path_count, generated, peak_frontier, open_set_size,
+             heap_pushes, heap_pops, compute_ns, render_ns, name_length,
+             result_name_length) = cls.HEADER.unpack_from(data)
+        except struct.error:
+            raise ValueError(f"{filename} is too short to be a search trace") from None
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"{filename} is not a version {cls.VERSION} search trace")
+
+        offset = cls.HEADER.size
+        name = data[offset:offset + name_length].decode("utf-8")
+        offset += name_length
+        result = SolveResult(data[offset:offset + result_name_length].decode("utf-8"))
+        offset += result_name_length
+        size = rows * cols
+        walls = data[offset:offset + size]
+        offset += size
+
+        start = (start_row, start_col) if start_row >= 0 else None
+        end = (end_row, end_col) if end_row >= 0 else None
+        trace = cls(rows, cols, walls, start, end, name)
+        for attr, count in (("visits", visit_count), ("parents", size), ("path", path_count)):
+            values = array('i')
+            values.frombytes(data[offset:offset + count * values.itemsize])
+            offset += count * values.itemsize
+            setattr(trace, attr, _to_little_endian(values))
+
+        if offset != len(data):
+            raise ValueError(f"{filename} is truncated or has trailing data")
+
+        result.nodes_expanded = visit_count
+        result.nodes_generated = generated
+        result.peak_frontier = peak_frontier
+        result.open_set_size = open_set_size
+        result.heap_pushes = heap_pushes
+        result.heap_pops = heap_pops
+        result.compute_ns = compute_ns
+        result.render_ns = render_ns
+        if trace.path:
+            result.path = [divmod(index, cols) for index in trace.path]
+        trace.result = result
+        return trace
+
+
+def _to_little_endian(values):
+    """Return an int array in little-endian byte order (a no-op on most machines)"""
+    if sys.byteorder == "little":
+        return values
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped
+
+
+class TracePlayer:
+    """Replays a trace onto a maze's display flags at any position
+
+    The timeline runs over every visit, then every path cell. Seeking sets
+    or clears only the flags of the steps in between, so moving the
+    playhead costs O(changed cells) and never re-runs the search.
+    """
+
+    def __init__(self, maze, trace, position=0):
+        self.maze = maze
+        self.trace = trace
+        self.position = 0
+        self.playing = False
+
+        # A* can expand a cell more than once; only the first expansion
+        # changes what is on screen
+        seen = bytearray(trace.rows * trace.cols)
+        self._first_visit = bytearray(len(trace.visits))
+        for step, index in enumerate(trace.visits):
+            if not seen[index]:
+                seen[index] = 1
+                self._first_visit[step] = 1
+
+        self.seek(position)
+
+    def __len__(self):
+        return len(self.trace)
+
+    @property
+    def at_end(self):
+        return self.position >= len(self.trace)
+
+    @property
+    def nodes_visited(self):
+        """Expanded nodes shown at the current position"""
+        return min(self.position, len(self.trace.visits))
+
+    @property
+    def path_length(self):
+        """Path cells shown at the current position"""
+        return max(0, self.position - len(self.trace.visits))
+
+    def seek(self, position):
+        """Move the playhead, applying or undoing the steps in between"""
+        position = min(max(position, 0), len(self.trace))
+        visits = self.trace.visits
+        path = self.trace.path
+        first_visit = self._first_visit
+        cols = self.trace.cols
+        visit_count = len(visits)
+
+        if position > self.position:
+            update = self.maze.set_flag
+            steps = range(self.position, position)
+        else:
+            update = self.maze.clear_flag
+            steps = range(self.position - 1, position - 1, -1)
+
+        for step in steps:
+            if step < visit_count:
+                if first_visit[step]:
+                    update(*divmod(visits[step], cols), FLAG_SEARCHED)
+            else:
+                update(*divmod(path[step - visit_count], cols), FLAG_PATH)
+
+        self.position = position
+
+    def advance(self, steps):
+        """Play forward by a number of steps, stopping at the end"""
+        self.seek(self.position + steps)
+        if self.at_end:
+            self.playing = False
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+Memoized solve results, keyed by the maze's content rather than its identity
+
+Asking the same algorithm for the same start and end on the same walls
+always gives the same search, so a cache keyed by a digest of the walls
+hands back the stored result (and, for the visualizer, the recorded trace)
+instead of running it again.
+"""
+
+import copy
+import sys
+from collections import OrderedDict
+from constants import SOLVE_CACHE_BYTES
+
+
+# Estimated bytes per path cell: a (row, col) tuple and its two ints
+_PATH_CELL_BYTES = sys.getsizeof((0, 0)) + 2 * sys.getsizeof(1000)
+
+# Estimated bytes of an entry besides its path and trace
+_ENTRY_BYTES = 512
+
+
+class SolveCache:
+    """Bounded LRU cache of SolveResults and, optionally, their SearchTraces
+
+    Entries are keyed by (rows, cols, walls digest, algorithm, start, end),
+    so a maze that gets the same walls back, or another Maze over the same
+    walls, finds the same entries. The memory of each entry is estimated
+    when it is stored, and the least recently used entries are evicted to
+    keep the total under ``max_bytes``. A cache with max_bytes=0 is off:
+    solve() runs every query without computing a key.
+    """
+
+    def __init__(self, max_bytes=SOLVE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    @staticmethod
+    def key(maze, algorithm, start, end):
+        """Cache key of a query on a maze's current walls"""
+        return (maze.rows, maze.cols, maze.walls_digest, algorithm, tuple(start), tuple(end))
+
+    def get(self, maze, algorithm, start, end, with_trace=False):
+        """Get a copy of the cached result of a query and its trace, or None on a miss
+
+        With with_trace=True, an entry stored without its trace is a miss.
+        """
+        key = self.key(maze, algorithm, start, end)
+        entry = self._entries.get(key)
+        if entry is None or (with_trace and entry[1] is None):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        result, trace, _ = entry
+        return copy.copy(result), trace
+
+    def put(self, maze, algorithm, start, end, result, trace=None):
+        """Store the result of a query, evicting old entries to make room
+
+        Returns False when the entry alone is larger than the cache.
+        """
+        size = self._entry_size(result, trace)
+        if size > self.max_bytes:
+            return False
+        key = self.key(maze, algorithm, start, end)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= previous[2]
+        self._entries[key] = (copy.copy(result), trace, size)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.size_bytes -= evicted
+            self.evictions += 1
+        return True
+
+    def solve(self, maze, solver, start, end):
+        """Solve a query through the cache; a hit returns a copy of the stored result"""
+        if not self.max_bytes:
+            return solver.solve(start, end)
+        cached = self.get(maze, solver.name, start, end)
+        if cached is not None:
+            return cached[0]
+        result = solver.solve(start, end)
+        self.put(maze, solver.name, start, end, result)
+        return result
+
+    def clear(self):
+        """Drop every entry, keeping the statistics"""
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def stats(self):
+        """Hit/miss statistics and memory use as a dict"""
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hit_rate, "evictions": self.evictions,
+                "size_bytes": self.size_bytes, "max_bytes": self.max_bytes}
+
+    def summary(self):
+        """One line of statistics for the HUD"""
+        return (f"cache {self.hits} hit / {self.misses} miss  {len(self)} entries  "
+                f"{self.size_bytes / 2 ** 20:.1f}/{self.max_bytes / 2 ** 20:.0f} MiB")
+
+    @staticmethod
+    def _entry_size(result, trace):
+        """Estimated memory of an entry, in bytes"""
+        size = _ENTRY_BYTES
+        if result.path:
+            size += sys.getsizeof(result.path) + len(result.path) * _PATH_CELL_BYTES
+        if trace is not None:
+            size += sum(sys.getsizeof(buffer)
+                        for buffer in (trace.walls, trace.visits, trace.parents, trace.path))
+        return size
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Checks every registered algorithm against BFS on small seeded mazes
+
+    python -m pytest -q
+"""
+
+import random
+
+import pytest
+
+from algorithms import ALGORITHMS, BFS, SearchState
+from maze import Maze, WALL_BOTTOM, WALL_LEFT, WALL_RIGHT, WALL_TOP
+
+
+ROWS = 15
+COLS = 20
+QUERIES = 25
+
+# Algorithms checked against BFS on every kind of maze
+SOLVERS = ["bfs", "dfs", "astar", "dijkstra", "bibfs", "biastar",
+           "tree", "jdijkstra", "jastar", "field"]
+
+# Depth-first search finds a path, but not necessarily a shortest one
+NOT_OPTIMAL = {"dfs"}
+
+
+def toggle_wall(maze, index, wall):
+    """Open or close one wall on both of its cells, as the generators keep them"""
+    other, facing = {WALL_TOP: (index - maze.cols, WALL_BOTTOM),
+                     WALL_BOTTOM: (index + maze.cols, WALL_TOP),
+                     WALL_LEFT: (index - 1, WALL_RIGHT),
+                     WALL_RIGHT: (index + 1, WALL_LEFT)}[wall]
+    maze.set_walls(index, maze.walls[index] ^ wall)
+    maze.set_walls(other, maze.walls[other] ^ facing)
+
+
+def edited_maze(seed):
+    """A braided maze with random walls opened and closed, which may cut cells off"""
+    maze = Maze(ROWS, COLS)
+    maze.generate_maze(seed, "braid")
+    rng = random.Random(seed)
+    for _ in range(ROWS * COLS // 3):
+        row = rng.randrange(1, ROWS - 1)
+        col = rng.randrange(1, COLS - 1)
+        toggle_wall(maze, maze.index(row, col), rng.choice((WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT)))
+    return maze
+
+
+def generated_maze(seed, generator):
+    maze = Maze(ROWS, COLS)
+    maze.generate_maze(seed, generator)
+    return maze
+
+
+MAZES = {
+    "perfect": lambda seed: generated_maze(seed, "backtracker"),
+    "braid": lambda seed: generated_maze(seed, "braid"),
+    "edited": edited_maze,
+}
+
+
+def random_queries(seed):
+    rng = random.Random(seed)
+    queries = [((0, 0), (0, 0))]
+    for _ in range(QUERIES):
+        queries.append(((rng.randrange(ROWS), rng.randrange(COLS)),
+                        (rng.randrange(ROWS), rng.randrange(COLS))))
+    return queries
+
+
+def assert_valid_path(maze, path, start, end):
+    assert path[0] == start
+    assert path[-1] == end
+    for (row, col), step in zip(path, path[1:]):
+        assert maze.index(*step) in maze.open_neighbors(maze.index(row, col))
+
+
+@pytest.mark.parametrize("kind", MAZES)
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("name", SOLVERS)
+def test_algorithm_finds_a_shortest_path(name, seed, kind):
+    maze = MAZES[kind](seed)
+    solver = ALGORITHMS[name](maze)
+    reference = BFS(maze)
+    for start, end in random_queries(seed):
+        expected = reference.solve(start, end)
+        result = solver.solve(start, end)
+        assert result.found == expected.found, (start, end)
+        if expected.found:
+            assert_valid_path(maze, result.path, start, end)
+            if name not in NOT_OPTIMAL:
+                assert result.path_length == expected.path_length, (start, end)
+
+
+def test_every_algorithm_is_checked():
+    assert sorted(SOLVERS) == sorted(ALGORITHMS)
+
+
+def test_epoch_wraparound():
+    state = SearchState(4)
+    state.epoch = SearchState.MAX_EPOCH - 1
+    epoch = state.begin()
+    assert epoch == SearchState.MAX_EPOCH
+    state.reached[2] = epoch
+    state.closed[3] = epoch
+    epoch = state.begin()
+    assert epoch == 1
+    assert state.reached[2] != epoch and state.closed[3] != epoch
+
+
+def test_search_after_epoch_wraparound():
+    maze = generated_maze(1, "braid")
+    expected = [BFS(maze).solve(start, end).path_length for start, end in random_queries(1)]
+    for name in ("bfs", "dijkstra"):
+        solver = ALGORITHMS[name](maze)
+        for (start, end), length in zip(random_queries(1), expected):
+            maze.search_states["forward"].epoch = SearchState.MAX_EPOCH
+            assert solver.solve(start, end).path_length == length
+
+
+def test_algorithms_share_the_maze_search_state():
+    maze = generated_maze(1, "braid")
+    BFS(maze).solve((0, 0), (5, 5))
+    state = maze.search_states["forward"]
+    ALGORITHMS["astar"](maze).solve((0, 0), (5, 5))
+    assert maze.search_states["forward"] is state
+
+
+@pytest.mark.parametrize("one_way, both_ways", [("bfs", "bibfs"), ("astar", "biastar")])
+def test_bidirectional_expands_fewer_cells(one_way, both_ways):
+    maze = Maze(40, 40)
+    maze.generate_maze(1, "braid")
+    rng = random.Random(1)
+    queries = [((rng.randrange(40), rng.randrange(40)), (rng.randrange(40), rng.randrange(40)))
+               for _ in range(QUERIES)]
+    expanded = {}
+    for name in (one_way, both_ways):
+        solver = ALGORITHMS[name](maze)
+        expanded[name] = sum(solver.solve(start, end).nodes_expanded for start, end in queries)
+    assert expanded[both_ways] < expanded[one_way]
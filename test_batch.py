@@ -0,0 +1,75 @@
+"""
+Checks that the process pool gives the same answers as solving serially
+
+    python -m pytest -q
+"""
+
+import pytest
+
+from algorithms import ALGORITHMS
+from batch import BatchSolver, random_queries
+from maze import Maze
+
+
+@pytest.fixture(scope="module")
+def maze():
+    maze = Maze(12, 16)
+    maze.generate_maze(5, "braid")
+    return maze
+
+
+@pytest.fixture(scope="module")
+def queries(maze):
+    return random_queries(maze, 40, list(ALGORITHMS), seed=5)
+
+
+def serial(maze, queries):
+    return [ALGORITHMS[algorithm](maze).solve(start, end) for start, end, algorithm in queries]
+
+
+def test_results_match_serial(maze, queries):
+    expected = serial(maze, queries)
+    with BatchSolver(maze, workers=2, chunk_size=7) as solver:
+        solved = dict(solver.solve(queries))
+    assert sorted(solved) == list(range(len(queries)))
+    for number, result in solved.items():
+        assert result.algorithm == expected[number].algorithm
+        assert result.path == expected[number].path
+        assert result.nodes_expanded == expected[number].nodes_expanded
+
+
+def test_results_without_paths(maze, queries):
+    expected = serial(maze, queries)
+    with BatchSolver(maze, workers=2, cache_bytes=0) as solver:
+        solved = dict(solver.solve(queries, keep_paths=False))
+    for number, result in solved.items():
+        assert result.path is None
+        assert result.found == expected[number].found
+        assert result.path_length == expected[number].path_length
+
+
+def test_traces_match_serial(maze, queries):
+    expected = serial(maze, queries[:5])
+    with BatchSolver(maze, workers=2, chunk_size=1) as solver:
+        futures = solver.submit(queries[:5], trace=True)
+        traces = dict(pair for future in futures for pair in future.result())
+    for number, trace in traces.items():
+        assert [divmod(index, maze.cols) for index in trace.path] == (expected[number].path or [])
+
+
+def test_unknown_algorithm(maze):
+    with BatchSolver(maze, workers=1) as solver:
+        with pytest.raises(ValueError):
+            solver.submit([((0, 0), (1, 1), "teleport")])
+
+
+def test_maze_over_a_page_sized_buffer():
+    maze = Maze(20, 30)
+    maze.generate_maze(1)
+    buffer = bytearray(4096)
+    buffer[:maze.size] = maze.walls
+    shared = Maze(maze.rows, maze.cols, walls=buffer)
+    assert len(shared.walls) == maze.size
+    assert shared.adjacency() == maze.adjacency()
+    assert shared.tree_index() is not None
+    assert shared.walls_digest == maze.walls_digest
\ No newline at end of file
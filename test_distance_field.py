@@ -0,0 +1,58 @@
+"""
+Checks distance fields against BFS
+
+    python -m pytest -q
+"""
+
+import pytest
+
+from algorithms import BFS, DistanceFieldPath
+from distance_field import DistanceField
+from maze import Maze
+
+
+def generated_maze(seed, generator):
+    maze = Maze(15, 20)
+    maze.generate_maze(seed, generator)
+    return maze
+
+
+@pytest.mark.parametrize("generator", ["backtracker", "braid"])
+def test_distances_match_bfs(generator):
+    maze = generated_maze(1, generator)
+    goal = maze.index(7, 9)
+    field = DistanceField(maze, goal)
+    reference = BFS(maze)
+    for cell in range(0, maze.size, 7):
+        expected = reference.solve(maze.position(cell), (7, 9)).path_length - 1
+        assert field.distance[cell] == expected
+        path = field.path_from(cell)
+        assert (path[0], path[-1]) == (cell, goal)
+        assert len(path) == expected + 1
+        for step, following in zip(path, path[1:]):
+            assert following in maze.open_neighbors(step)
+    assert field.max_distance == max(field.distance)
+
+
+def test_unreachable_cells():
+    maze = Maze(2, 3)
+    maze._remove_wall(0, 1)
+    field = DistanceField(maze, 0)
+    assert list(field.distance) == [0, 1, -1, -1, -1, -1]
+    assert field.path_from(5) is None
+    assert field.heat == bytes([0, DistanceField.FARTHEST] + [DistanceField.UNREACHABLE] * 4)
+
+
+def test_field_is_cached_per_goal_and_walls():
+    maze = generated_maze(1, "braid")
+    field = maze.distance_field(3)
+    assert maze.distance_field(3) is field
+    assert maze.distance_field(4) is not field
+    maze.generate_maze(2, "braid")
+    assert maze.distance_field(4).distance != field.distance
+
+
+def test_prepare_builds_the_field():
+    maze = generated_maze(1, "braid")
+    DistanceFieldPath(maze).prepare((0, 0), (14, 19))
+    assert maze._distance_field_key == (maze.walls_version, maze.index(14, 19))
\ No newline at end of file
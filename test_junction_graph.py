@@ -0,0 +1,66 @@
+"""
+Checks that the junction graph contracts exactly the maze's corridors
+
+    python -m pytest -q
+"""
+
+import pytest
+
+from algorithms import ALGORITHMS, JunctionDijkstra
+from maze import Maze
+
+
+def generated_maze(seed, generator):
+    maze = Maze(20, 25)
+    maze.generate_maze(seed, generator)
+    return maze
+
+
+def edges(graph, node):
+    first, last = graph.edge_offsets[node], graph.edge_offsets[node + 1]
+    return list(zip(graph.edge_targets[first:last], graph.edge_weights[first:last],
+                    graph.edge_lasts[first:last]))
+
+
+@pytest.mark.parametrize("generator", ["backtracker", "braid"])
+def test_nodes_are_junctions_and_dead_ends(generator):
+    maze = generated_maze(1, generator)
+    graph = maze.junction_graph()
+    offsets, _ = maze.adjacency()
+    degree = [offsets[cell + 1] - offsets[cell] for cell in range(maze.size)]
+    assert graph.nodes == [cell for cell in range(maze.size) if degree[cell] != 2]
+    assert all(graph.is_node(cell) == (degree[cell] != 2) for cell in range(maze.size))
+
+
+@pytest.mark.parametrize("generator", ["backtracker", "braid"])
+def test_edges_follow_corridors(generator):
+    maze = generated_maze(2, generator)
+    graph = maze.junction_graph()
+    for node in graph.nodes:
+        walked = []
+        for first in maze.open_neighbors(node):
+            trail = []
+            end, steps, last = graph.walk(node, first, trail=trail)
+            if end == node:
+                continue
+            assert len(trail) == steps and trail[-1] == end
+            assert not any(graph.is_node(cell) for cell in trail[:-1])
+            walked.append((end, steps, last))
+        assert edges(graph, node) == walked
+        for target, weight, _ in walked:
+            assert (node, weight) in [(back, steps) for back, steps, _ in edges(graph, target)]
+
+
+def test_junction_search_expands_fewer_cells():
+    maze = generated_maze(3, "braid")
+    start, end = (0, 0), (19, 24)
+    expanded = {name: ALGORITHMS[name](maze).solve(start, end).nodes_expanded
+                for name in ("dijkstra", "jdijkstra", "astar", "jastar")}
+    assert expanded["jdijkstra"] < expanded["dijkstra"]
+    assert expanded["jastar"] < expanded["astar"]
+
+
+def test_prepare_builds_the_graph():
+    maze = generated_maze(1, "braid")
+    JunctionDijkstra(maze).prepare()
+    assert maze._junction_graph_version == maze.walls_version
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+Checks SolveResult counters and their JSON/CSV export
+
+    python -m pytest -q
+"""
+
+import csv
+import json
+
+from algorithms import BFS
+from maze import Maze
+from results import SolveResult, append_csv, write_json
+
+
+def solved():
+    maze = Maze(8, 10)
+    maze.generate_maze(2)
+    return BFS(maze).solve((0, 0), (7, 9))
+
+
+def test_counters():
+    result = solved()
+    assert result.found
+    assert result.path_length == len(result.path)
+    assert result.nodes_expanded > 0
+    assert result.compute_ns > 0
+
+
+def test_empty_result():
+    result = SolveResult("bfs")
+    assert not result.found
+    assert result.path_length == 0
+
+
+def test_drop_path_keeps_found_and_length():
+    result = solved()
+    exported = result.to_dict()
+    result.drop_path()
+    assert result.path is None
+    assert result.found
+    assert result.to_dict() == exported
+
+
+def test_drop_path_of_a_miss():
+    result = SolveResult("bfs")
+    result.drop_path()
+    assert not result.found
+    assert result.path_length == 0
+
+
+def test_write_json(tmp_path):
+    filename = tmp_path / "results.json"
+    results = [solved(), SolveResult("dfs")]
+    write_json(results, filename)
+    with open(filename) as f:
+        assert json.load(f) == [result.to_dict() for result in results]
+
+
+def test_append_csv(tmp_path):
+    filename = tmp_path / "results.csv"
+    append_csv([solved()], filename)
+    append_csv([SolveResult("dfs")], filename)
+    with open(filename, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == list(SolveResult.FIELDS)
+    assert [row["algorithm"] for row in rows] == ["bfs", "dfs"]
+    assert [row["found"] for row in rows] == ["True", "False"]
+    assert int(rows[0]["path_length"]) == solved().path_length
\ No newline at end of file
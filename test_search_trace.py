@@ -0,0 +1,74 @@
+"""
+Checks that search traces survive a save/load round trip
+
+    python -m pytest -q
+"""
+
+import pytest
+
+from algorithms import AStar
+from maze import Maze
+from search_trace import SearchTrace
+
+
+@pytest.fixture
+def trace():
+    maze = Maze(12, 16)
+    maze.generate_maze(4, "braid")
+    return SearchTrace.capture(maze, AStar(maze), (0, 0), (11, 15), "A* Search")
+
+
+def test_round_trip(trace, tmp_path):
+    filename = tmp_path / "search.trace"
+    trace.save(filename)
+    loaded = SearchTrace.load(filename)
+    assert (loaded.rows, loaded.cols) == (trace.rows, trace.cols)
+    assert loaded.walls == trace.walls
+    assert (loaded.start, loaded.end) == (trace.start, trace.end)
+    assert loaded.algorithm == "A* Search"
+    assert loaded.visits == trace.visits
+    assert loaded.parents == trace.parents
+    assert loaded.path == trace.path
+    assert loaded.result.to_dict() == trace.result.to_dict()
+    assert loaded.result.path == trace.result.path
+
+
+def test_round_trip_without_markers(tmp_path):
+    maze = Maze(3, 4)
+    filename = tmp_path / "empty.trace"
+    SearchTrace.for_maze(maze).save(filename)
+    loaded = SearchTrace.load(filename)
+    assert (loaded.start, loaded.end) == (None, None)
+    assert not loaded.result.found
+
+
+@pytest.mark.parametrize("missing", [1, 4, 100])
+def test_truncated_file(trace, tmp_path, missing):
+    filename = tmp_path / "search.trace"
+    trace.save(filename)
+    filename.write_bytes(filename.read_bytes()[:-missing])
+    with pytest.raises(ValueError):
+        SearchTrace.load(filename)
+
+
+def test_file_shorter_than_the_header(trace, tmp_path):
+    filename = tmp_path / "search.trace"
+    trace.save(filename)
+    filename.write_bytes(filename.read_bytes()[:SearchTrace.HEADER.size - 1])
+    with pytest.raises(ValueError, match="too short"):
+        SearchTrace.load(filename)
+
+
+def test_trailing_data(trace, tmp_path):
+    filename = tmp_path / "search.trace"
+    trace.save(filename)
+    filename.write_bytes(filename.read_bytes() + b"\0")
+    with pytest.raises(ValueError):
+        SearchTrace.load(filename)
+
+
+def test_not_a_trace(tmp_path):
+    filename = tmp_path / "notes.txt"
+    filename.write_bytes(b"not a trace" * 10)
+    with pytest.raises(ValueError):
+        SearchTrace.load(filename)
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Checks the solve cache and the wall digest it is keyed by
+
+    python -m pytest -q
+"""
+
+from algorithms import BFS
+from maze import Maze, WALL_LEFT, WALL_RIGHT
+from solve_cache import SolveCache
+
+
+def corridor(length, gap):
+    """A one-row corridor open everywhere except between cells gap and gap + 1"""
+    maze = Maze(1, length)
+    for index in range(length - 1):
+        if index != gap:
+            maze.set_walls(index, maze.walls[index] & ~WALL_RIGHT)
+            maze.set_walls(index + 1, maze.walls[index + 1] & ~WALL_LEFT)
+    return maze
+
+
+def test_walls_digest_follows_edits():
+    maze = corridor(70, 0)
+    original = maze.walls_digest
+    maze.set_walls(30, maze.walls[30] | WALL_RIGHT)
+    assert maze.walls_digest != original
+    maze.set_walls(30, maze.walls[30] & ~WALL_RIGHT)
+    assert maze.walls_digest == original
+
+
+def test_walls_digest_of_cells_far_apart():
+    assert corridor(70, 0).walls_digest != corridor(70, 61).walls_digest
+
+
+def test_walls_digest_matches_a_copy():
+    maze = corridor(70, 5)
+    copy = Maze(1, 70)
+    copy.restore_walls(maze.walls)
+    assert copy.walls_digest == maze.walls_digest
+
+
+def test_solve_cache_keeps_mazes_apart():
+    cache = SolveCache()
+    open_corridor = corridor(70, 0)
+    closed_corridor = corridor(70, 61)
+    assert cache.solve(open_corridor, BFS(open_corridor), (0, 60), (0, 63)).found
+    assert not cache.solve(closed_corridor, BFS(closed_corridor), (0, 60), (0, 63)).found
+    assert cache.solve(open_corridor, BFS(open_corridor), (0, 60), (0, 63)).found
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+
+
+def test_solve_cache_hit_is_a_copy():
+    cache = SolveCache()
+    maze = corridor(10, 9)
+    first = cache.solve(maze, BFS(maze), (0, 0), (0, 9))
+    first.nodes_expanded = -1
+    assert cache.solve(maze, BFS(maze), (0, 0), (0, 9)).nodes_expanded != -1
+
+
+def test_solve_cache_evicts_least_recently_used():
+    maze = corridor(10, 9)
+    solver = BFS(maze)
+    cache = SolveCache()
+    cache.solve(maze, solver, (0, 0), (0, 9))
+    cache.max_bytes = cache.size_bytes
+    cache.solve(maze, solver, (0, 1), (0, 9))
+    assert cache.evictions >= 1
+    assert cache.get(maze, "bfs", (0, 0), (0, 9)) is None
+    assert cache.size_bytes <= cache.max_bytes
+
+
+def test_solve_cache_turned_off():
+    cache = SolveCache(0)
+    maze = corridor(10, 9)
+    assert cache.solve(maze, BFS(maze), (0, 0), (0, 9)).found
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Checks tree index queries against BFS on perfect mazes
+
+    python -m pytest -q
+"""
+
+import random
+
+import pytest
+
+from algorithms import BFS, TreePath
+from maze import Maze
+from tree_index import TreeIndex
+
+
+ROWS = 30
+COLS = 40
+
+
+def perfect_maze(seed):
+    maze = Maze(ROWS, COLS)
+    maze.generate_maze(seed)
+    return maze
+
+
+def random_cells(seed, count=40):
+    rng = random.Random(seed)
+    return [(rng.randrange(ROWS * COLS), rng.randrange(ROWS * COLS)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_distance_matches_bfs(seed):
+    maze = perfect_maze(seed)
+    index = maze.tree_index()
+    reference = BFS(maze)
+    for a, b in random_cells(seed):
+        expected = reference.solve(maze.position(a), maze.position(b)).path_length - 1
+        assert index.distance(a, b) == expected
+        assert index.distance(b, a) == expected
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_path_walks_the_tree(seed):
+    maze = perfect_maze(seed)
+    index = maze.tree_index()
+    for a, b in random_cells(seed):
+        path = index.path(a, b)
+        assert (path[0], path[-1]) == (a, b)
+        assert len(path) == index.distance(a, b) + 1
+        for cell, following in zip(path, path[1:]):
+            assert following in maze.open_neighbors(cell)
+
+
+def test_distance_to_itself():
+    index = perfect_maze(1).tree_index()
+    assert index.distance(7, 7) == 0
+    assert index.path(7, 7) == [7]
+
+
+def test_a_maze_with_loops_has_no_tree():
+    maze = Maze(ROWS, COLS)
+    maze.generate_maze(1, "braid")
+    assert TreeIndex.build(maze) is None
+    assert maze.tree_index() is None
+
+
+def test_a_closed_off_cell_has_no_tree():
+    assert TreeIndex.build(Maze(3, 3)) is None
+
+
+def test_index_follows_the_walls():
+    maze = perfect_maze(1)
+    first = maze.tree_index()
+    assert maze.tree_index() is first
+    maze.generate_maze(2)
+    assert maze.tree_index() is not first
+
+
+def test_prepare_builds_the_index():
+    maze = perfect_maze(1)
+    TreePath(maze).prepare()
+    assert maze._tree_index_version == maze.walls_version
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Instant path queries on perfect mazes
+
+A perfect maze, as the recursive backtracker generates it, is a spanning
+tree of the grid: there is exactly one path between any two cells. Once the
+tree is rooted and indexed, the length of that path comes from a range
+minimum over the DFS order, and the path itself from walking parent links,
+with no search at all.
+"""
+
+from array import array
+
+
+class TreeIndex:
+    """Distance and path queries over the spanning tree of a perfect maze
+
+    Cells are numbered by a DFS preorder, so every subtree is a contiguous
+    range. For two cells with preorder positions l < r, the shallowest cell
+    in positions (l, r] is a child of their lowest common ancestor. That
+    range minimum is answered in O(1) from a sparse table over blocks of
+    BLOCK positions, plus a scan of at most two partial blocks.
+    """
+
+    # Preorder positions per sparse table block
+    BLOCK = 64
+
+    def __init__(self, parent, depth, preorder_position, depths_by_position):
+        self.parent = parent
+        self.depth = depth
+        self._position = preorder_position
+        self._depths = depths_by_position
+
+        block = self.BLOCK
+        minima = array('i', [min(depths_by_position[i:i + block])
+                             for i in range(0, len(depths_by_position), block)])
+        # Level k holds the minimum of 2**k consecutive blocks
+        self._levels = [minima]
+        span = 1
+        while 2 * span <= len(minima):
+            previous = self._levels[-1]
+            self._levels.append(array('i', map(min, previous[:len(previous) - span], previous[span:])))
+            span *= 2
+
+    @classmethod
+    def build(cls, maze):
+        """Index a maze, or return None when it is not a tree
+
+        A tree has exactly size - 1 passages and reaches every cell from
+        any one; anything else (loops, closed-off cells) needs a search.
+        """
+        offsets, neighbors = maze.adjacency()
+        size = maze.size
+        if len(neighbors) != 2 * (size - 1):
+            return None
+
+        parent = array('i', [-1]) * size
+        depth = array('i', [0]) * size
+        position = array('i', [0]) * size
+        preorder = array('i')
+        seen = bytearray(size)
+        seen[0] = 1
+        stack = [0]
+        while stack:
+            cell = stack.pop()
+            position[cell] = len(preorder)
+            preorder.append(cell)
+            child_depth = depth[cell] + 1
+            for neighbor in neighbors[offsets[cell]:offsets[cell + 1]]:
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
+                    parent[neighbor] = cell
+                    depth[neighbor] = child_depth
+                    stack.append(neighbor)
+        if len(preorder) != size:
+            return None
+        return cls(parent, depth, position, array('i', map(depth.__getitem__, preorder)))
+
+    def distance(self, a, b):
+        """Number of steps on the path between two cell indices"""
+        if a == b:
+            return 0
+        first, last = sorted((self._position[a], self._position[b]))
+        ancestor_depth = self._min_depth(first + 1, last) - 1
+        return self.depth[a] + self.depth[b] - 2 * ancestor_depth
+
+    def path(self, a, b):
+        """Cell indices on the path from a to b, both included, in O(path length)"""
+        parent = self.parent
+        depth_a = self.depth[a]
+        depth_b = self.depth[b]
+        up = []
+        down = []
+        while depth_a > depth_b:
+            up.append(a)
+            a = parent[a]
+            depth_a -= 1
+        while depth_b > depth_a:
+            down.append(b)
+            b = parent[b]
+            depth_b -= 1
+        while a != b:
+            up.append(a)
+            a = parent[a]
+            down.append(b)
+            b = parent[b]
+        up.append(a)
+        down.reverse()
+        return up + down
+
+    def _min_depth(self, first, last):
+        """Smallest depth at preorder positions first..last (inclusive)"""
+        block = self.BLOCK
+        depths = self._depths
+        first_block = first // block
+        last_block = last // block
+        if last_block - first_block < 2:
+            return min(depths[first:last + 1])
+
+        low = min(depths[first:(first_block + 1) * block])
+        high = min(depths[last_block * block:last + 1])
+        first_block += 1
+        last_block -= 1
+        level = (last_block - first_block + 1).bit_length() - 1
+        table = self._levels[level]
+        return min(low, high, table[first_block], table[last_block - (1 << level) + 1])
\ No newline at end of file
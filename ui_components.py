@@ -3,9 +3,56 @@ UI Components for the Algorithm Visualizer
 """
 
 import pygame
+from collections import OrderedDict
 from constants import *
 
 
+class FontRegistry:
+    """Shared pygame fonts, created once per (name, size)"""
+    
+    def __init__(self):
+        self._fonts = {}
+    
+    def get(self, size, name=None):
+        """Get the font for a size, loading it on first use"""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pygame.font.Font(name, size)
+        return font
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces keyed by (font, text, colour)"""
+    
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+    
+    def render(self, font, text, color):
+        """Render antialiased text, reusing the surface for repeated requests"""
+        key = (font, text, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        
+        surface = font.render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+    
+    def clear(self):
+        """Drop all cached surfaces"""
+        self._surfaces.clear()
+
+
+# Shared instances used by every component and the renderer
+fonts = FontRegistry()
+text_cache = TextCache()
+
+
 class Button:
     """A modern clickable button with hover effects and shadows"""
     
@@ -37,7 +84,7 @@ class Button:
         pygame.draw.rect(screen, border_color, self.rect, 2, border_radius=self.BORDER_RADIUS)
         
         # Draw text
-        text_surf = font.render(self.text, True, self.text_color)
+        text_surf = text_cache.render(font, self.text, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
     
@@ -50,8 +97,11 @@ class Button:
         return self.rect.collidepoint(pos)
     
     def update_hover(self, pos):
-        """Update hover state"""
-        self.hovered = self.rect.collidepoint(pos)
+        """Update hover state, returning True if it changed"""
+        hovered = bool(self.rect.collidepoint(pos))
+        changed = hovered != self.hovered
+        self.hovered = hovered
+        return changed
 
 
 class Dropdown:
@@ -77,7 +127,7 @@ class Dropdown:
         pygame.draw.rect(screen, WHITE, self.rect, self.BORDER_WIDTH, border_radius=self.BORDER_RADIUS)
         
         # Draw selected option text
-        text_surf = self.font.render(self.options[self.selected], True, TEXT_COLOR)
+        text_surf = text_cache.render(self.font, self.options[self.selected], TEXT_COLOR)
         text_rect = text_surf.get_rect(midleft=(self.rect.x + self.TEXT_PADDING, self.rect.centery))
         screen.blit(text_surf, text_rect)
         
@@ -135,7 +185,7 @@ class Dropdown:
         pygame.draw.rect(screen, color, rect, border_radius=self.BORDER_RADIUS)
         pygame.draw.rect(screen, WHITE, rect, self.BORDER_WIDTH, border_radius=self.BORDER_RADIUS)
         
-        text_surf = self.font.render(text, True, TEXT_COLOR)
+        text_surf = text_cache.render(self.font, text, TEXT_COLOR)
         text_rect = text_surf.get_rect(midleft=(rect.x + self.TEXT_PADDING, rect.centery))
         screen.blit(text_surf, text_rect)
     
@@ -166,13 +216,90 @@ class Dropdown:
         return False
     
     def update_hover(self, pos):
-        """Update which option is being hovered"""
+        """Update which option is being hovered, returning True if it changed"""
+        previous = self.hovered_option
         self.hovered_option = -1
         if self.expanded:
             for i, rect in enumerate(self.option_rects):
                 if rect.collidepoint(pos):
                     self.hovered_option = i
                     break
+        return self.hovered_option != previous
+
+
+class Slider:
+    """A horizontal slider that selects one value from a list"""
+    
+    TRACK_HEIGHT = 4
+    KNOB_RADIUS = 7
+    
+    def __init__(self, x, y, width, values, selected=0):
+        self.rect = pygame.Rect(x, y - self.KNOB_RADIUS, width, 2 * self.KNOB_RADIUS)
+        self.values = values
+        self.selected = selected
+        self.dragging = False
+        self.hovered = False
+    
+    @property
+    def value(self):
+        """The currently selected value"""
+        return self.values[self.selected]
+    
+    def draw(self, screen):
+        """Draw the track, the filled part up to the knob, and the knob"""
+        track = pygame.Rect(self.rect.x, self.rect.centery - self.TRACK_HEIGHT // 2,
+                            self.rect.width, self.TRACK_HEIGHT)
+        knob_x = self._knob_x()
+        pygame.draw.rect(screen, LIGHT_GRAY, track, border_radius=2)
+        pygame.draw.rect(screen, ACCENT_COLOR, (track.x, track.y, knob_x - track.x, track.height),
+                         border_radius=2)
+        
+        knob_color = BUTTON_HOVER if self.hovered or self.dragging else ACCENT_COLOR
+        pygame.draw.circle(screen, knob_color, (knob_x, self.rect.centery), self.KNOB_RADIUS)
+        pygame.draw.circle(screen, WHITE, (knob_x, self.rect.centery), self.KNOB_RADIUS, 2)
+    
+    def _knob_x(self):
+        """Screen x of the knob for the selected value"""
+        if len(self.values) < 2:
+            return self.rect.x
+        return self.rect.x + self.selected * self.rect.width // (len(self.values) - 1)
+    
+    def handle_click(self, pos):
+        """Start dragging if the click hits the slider"""
+        if not self.rect.inflate(self.KNOB_RADIUS * 2, 0).collidepoint(pos):
+            return False
+        self.dragging = True
+        self.handle_drag(pos)
+        return True
+    
+    def handle_drag(self, pos):
+        """Move the knob to the value nearest the mouse, returning True if it changed"""
+        if not self.dragging:
+            return False
+        steps = len(self.values) - 1
+        offset = min(max(pos[0] - self.rect.x, 0), self.rect.width)
+        return self.select(round(offset * steps / self.rect.width) if steps else 0)
+    
+    def handle_release(self):
+        """Stop dragging"""
+        self.dragging = False
+    
+    def step(self, delta):
+        """Move the selection by delta positions, returning True if it changed"""
+        return self.select(min(max(self.selected + delta, 0), len(self.values) - 1))
+    
+    def select(self, index):
+        """Select a value by index, returning True if it changed"""
+        changed = index != self.selected
+        self.selected = index
+        return changed
+    
+    def update_hover(self, pos):
+        """Update hover state, returning True if it changed"""
+        hovered = bool(self.rect.inflate(self.KNOB_RADIUS * 2, 0).collidepoint(pos))
+        changed = hovered != self.hovered
+        self.hovered = hovered
+        return changed
 
 
 class Label:
@@ -187,7 +314,7 @@ class Label:
         
     def draw(self, screen):
         """Draw the label"""
-        text_surf = self.font.render(self.text, True, self.color)
+        text_surf = text_cache.render(self.font, self.text, self.color)
         screen.blit(text_surf, (self.x, self.y))
         
     def update_text(self, text):
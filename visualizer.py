@@ -2,13 +2,21 @@
 Algorithm Visualizer - Modern UI for Breadth-First Search visualization
 """
 
+import math
 import pygame
 import sys
 import time
 from constants import *
-from ui_components import  Button, Label, Dropdown
-from maze import Maze
-from algorithms import BFS, AStar, DFS, Dijkstra
+from ui_components import  Button, Label, Dropdown, Slider, fonts, text_cache
+from maze import Maze, FLAG_PATH
+from camera import Camera
+from search_trace import SearchTrace, TracePlayer
+from results import write_json, append_csv
+from solve_cache import SolveCache
+from profiler import FrameProfiler
+from race import Race
+from algorithms import (BFS, AStar, DFS, Dijkstra, BidirectionalBFS, BidirectionalAStar,
+                        TreePath, JunctionAStar, DistanceFieldPath, SolveTask)
 
 
 class UIRenderer:
@@ -26,36 +34,61 @@ class UIRenderer:
         self.info_font = info_font
         self.maze_offset_x = maze_offset_x
         self.maze_offset_y = maze_offset_y
+        self._background = None
     
-    def draw_title(self):
+    def draw_background(self):
+        """Blit the static panels (title, maze border, legend)
+        
+        They never change while the app runs, so they are composited once
+        into a window-sized layer and reused every frame.
+        """
+        if self._background is None:
+            self._background = pygame.Surface(self.screen.get_size())
+            self._background.fill(BACKGROUND)
+            self.draw_title(self._background)
+            self.draw_maze_border(self._background)
+            self.draw_legend(self._background)
+        self.screen.blit(self._background, (0, 0))
+    
+    def restore_background(self, rect):
+        """Blit one area of the static panels back, e.g. under a changing control"""
+        if self._background is None:
+            self.draw_background()
+        self.screen.blit(self._background, rect, rect)
+    
+    def draw_title(self, surface=None):
         """Draw the title with modern styling"""
+        if surface is None:
+            surface = self.screen
+        
         # Draw title background panel
         panel_height = 70
-        pygame.draw.rect(self.screen, PANEL_BG, (0, 0, WINDOW_WIDTH, panel_height))
-        pygame.draw.rect(self.screen, ACCENT_COLOR, (0, panel_height - 3, WINDOW_WIDTH, 3))
+        pygame.draw.rect(surface, PANEL_BG, (0, 0, WINDOW_WIDTH, panel_height))
+        pygame.draw.rect(surface, ACCENT_COLOR, (0, panel_height - 3, WINDOW_WIDTH, 3))
         
         # Main title
-        title = self.title_font.render("Div's ALGORITHM VISUALIZER", True, DARK_GRAY)
-        subtitle_font = pygame.font.Font(None, 22)
-        subtitle = subtitle_font.render("Pathfinding algorithms", True, GRAY)
+        title = text_cache.render(self.title_font, "Div's ALGORITHM VISUALIZER", DARK_GRAY)
+        subtitle = text_cache.render(fonts.get(22), "Pathfinding algorithms", GRAY)
         
         # Center the titles
         title_x = WINDOW_WIDTH // 2 - title.get_width() // 2
         subtitle_x = WINDOW_WIDTH // 2 - subtitle.get_width() // 2
         
-        self.screen.blit(title, (title_x, 12))
-        self.screen.blit(subtitle, (subtitle_x, 45))
+        surface.blit(title, (title_x, 12))
+        surface.blit(subtitle, (subtitle_x, 45))
     
-    def draw_maze_border(self):
+    def draw_maze_border(self, surface=None):
         """Draw modern border around the maze"""
-        maze_width = MAZE_COLS * CELL_SIZE
-        maze_height = MAZE_ROWS * CELL_SIZE
+        if surface is None:
+            surface = self.screen
+        maze_width = MAZE_VIEW_WIDTH
+        maze_height = MAZE_VIEW_HEIGHT
         border_padding = 8
         
         # Outer shadow effect
         shadow_offset = 3
         pygame.draw.rect(
-            self.screen, (180, 180, 180),
+            surface, (180, 180, 180),
             (self.maze_offset_x - border_padding + shadow_offset, 
              self.maze_offset_y - border_padding + shadow_offset,
              maze_width + 2 * border_padding, maze_height + 2 * border_padding),
@@ -64,22 +97,24 @@ class UIRenderer:
         
         # Main border
         pygame.draw.rect(
-            self.screen, PANEL_BG,
+            surface, PANEL_BG,
             (self.maze_offset_x - border_padding, self.maze_offset_y - border_padding,
              maze_width + 2 * border_padding, maze_height + 2 * border_padding),
             border_radius=8
         )
         
         pygame.draw.rect(
-            self.screen, MAZE_BORDER,
+            surface, MAZE_BORDER,
             (self.maze_offset_x - border_padding, self.maze_offset_y - border_padding,
              maze_width + 2 * border_padding, maze_height + 2 * border_padding),
             4, border_radius=8
         )
     
-    def draw_legend(self):
+    def draw_legend(self, surface=None):
         """Draw the modern legend panel on the right side"""
-        maze_width = MAZE_COLS * CELL_SIZE
+        if surface is None:
+            surface = self.screen
+        maze_width = MAZE_VIEW_WIDTH
         legend_x = self.maze_offset_x + maze_width + self.LEGEND_PADDING
         legend_y = self.maze_offset_y + 20
         
@@ -87,20 +122,19 @@ class UIRenderer:
         panel_width = 200
         panel_height = 280
         panel_padding = 20
-        pygame.draw.rect(self.screen, PANEL_BG, 
+        pygame.draw.rect(surface, PANEL_BG, 
                         (legend_x - panel_padding, legend_y - panel_padding, panel_width, panel_height),
                         border_radius=10)
-        pygame.draw.rect(self.screen, ACCENT_COLOR, 
+        pygame.draw.rect(surface, ACCENT_COLOR, 
                         (legend_x - panel_padding, legend_y - panel_padding, panel_width, panel_height),
                         3, border_radius=10)
         
         # Legend title with more padding
-        title_font = pygame.font.Font(None, 26)
-        title = title_font.render("Legend", True, DARK_GRAY)
-        self.screen.blit(title, (legend_x + 10, legend_y + 5))
+        title = text_cache.render(fonts.get(26), "Legend", DARK_GRAY)
+        surface.blit(title, (legend_x + 10, legend_y + 5))
         
         # Divider line with padding
-        pygame.draw.line(self.screen, LIGHT_GRAY, 
+        pygame.draw.line(surface, LIGHT_GRAY, 
                         (legend_x + 10, legend_y + 32), 
                         (legend_x + 160, legend_y + 32), 2)
         
@@ -122,34 +156,63 @@ class UIRenderer:
             # Draw colored indicator with more spacing
             if label == "Wall":
                 # Square for walls
-                pygame.draw.rect(self.screen, color, 
+                pygame.draw.rect(surface, color, 
                                (legend_x + 15, y + 3, 16, 16), border_radius=3)
             else:
                 # Circle for other items
-                pygame.draw.circle(self.screen, color, 
+                pygame.draw.circle(surface, color, 
                                  (legend_x + 23, y + 11), self.CIRCLE_RADIUS)
-                pygame.draw.circle(self.screen, DARK_GRAY, 
+                pygame.draw.circle(surface, DARK_GRAY, 
                                  (legend_x + 23, y + 11), self.CIRCLE_RADIUS, 2)
             
             # Draw label with more spacing
-            text = self.small_font.render(label, True, DARK_GRAY)
-            self.screen.blit(text, (legend_x + 50, y + 3))
+            text = text_cache.render(self.small_font, label, DARK_GRAY)
+            surface.blit(text, (legend_x + 50, y + 3))
     
-    def draw_statistics(self, solve_time, nodes_visited, path_length, algorithm_name=None):
-        """Draw the modern statistics panel below the maze"""
-        if solve_time <= 0:
+    STATS_BOX_HEIGHT = 95
+    STATS_SHADOW_OFFSET = 3
+    
+    def statistics_rect(self):
+        """Screen area covered by the statistics panel, including its shadow"""
+        maze_height = MAZE_VIEW_HEIGHT
+        return pygame.Rect(self.maze_offset_x, self.maze_offset_y + maze_height + 35,
+                           MAZE_VIEW_WIDTH + self.STATS_SHADOW_OFFSET,
+                           self.STATS_BOX_HEIGHT + self.STATS_SHADOW_OFFSET)
+    
+    HUD_RECT = pygame.Rect(10, 4, 360, 62)
+    
+    def draw_profiler_hud(self, lines):
+        """Draw the profiler HUD in the free left part of the title panel
+        
+        Its text changes every frame, so it is rendered directly instead of
+        going through the text cache.
+        """
+        self.restore_background(self.HUD_RECT)
+        font = fonts.get(16)
+        for i, line in enumerate(lines[:4]):
+            self.screen.blit(font.render(line, True, GRAY), (self.HUD_RECT.x, self.HUD_RECT.y + i * 15))
+        return self.HUD_RECT
+    
+    def draw_statistics(self, result, nodes_visited, path_length, algorithm_name=None):
+        """Draw the modern statistics panel below the maze
+        
+        Counters come from the search's SolveResult; nodes_visited and
+        path_length are what is currently shown, which differs from the
+        result while a search or its replay is still animating.
+        """
+        if result is None:
             return
         
         # Position below maze with more spacing
-        maze_height = MAZE_ROWS * CELL_SIZE
+        maze_height = MAZE_VIEW_HEIGHT
         stats_y = self.maze_offset_y + maze_height + 35
         stats_x = self.maze_offset_x
         
-        box_width = MAZE_COLS * CELL_SIZE
-        box_height = 95
+        box_width = MAZE_VIEW_WIDTH
+        box_height = self.STATS_BOX_HEIGHT
         
         # Panel background with shadow
-        shadow_offset = 3
+        shadow_offset = self.STATS_SHADOW_OFFSET
         pygame.draw.rect(self.screen, (180, 180, 180),
                         (stats_x + shadow_offset, stats_y + shadow_offset, 
                          box_width, box_height), border_radius=10)
@@ -160,69 +223,120 @@ class UIRenderer:
                         (stats_x, stats_y, box_width, box_height), 3, border_radius=10)
         
         # Title with more padding - show algorithm name
-        title_font = pygame.font.Font(None, 26)
         title_text = f"{algorithm_name} Statistics" if algorithm_name else "Statistics"
-        title = title_font.render(title_text, True, DARK_GRAY)
+        title = text_cache.render(fonts.get(26), title_text, DARK_GRAY)
         self.screen.blit(title, (stats_x + 30, stats_y + 18))
         
         # Stats in horizontal layout
         stats = [
-            ("Time:", f"{solve_time:.3f}s"),
+            ("Compute:", f"{result.compute_ms:.2f}ms"),
+            ("Render:", f"{result.render_ms:.0f}ms"),
             ("Nodes Visited:", f"{nodes_visited}"),
+            ("Generated:", f"{result.nodes_generated}"),
+            ("Peak Frontier:", f"{result.peak_frontier}"),
+            ("Heap Push/Pop:", f"{result.heap_pushes}/{result.heap_pops}"),
             ("Path Length:", f"{path_length}"),
         ]
         
-        stat_font = pygame.font.Font(None, 20)
-        value_font = pygame.font.Font(None, 24)
+        stat_font = fonts.get(18)
+        value_font = fonts.get(22)
         
         # Calculate spacing for horizontal layout with more padding
-        stat_spacing = box_width // 3
-        start_x = stats_x + 50
+        stat_spacing = (box_width - 40) // len(stats)
+        start_x = stats_x + 30
         y = stats_y + 43
         
         for i, (label, value) in enumerate(stats):
             x = start_x + i * stat_spacing
-            label_surf = stat_font.render(label, True, GRAY)
-            value_surf = value_font.render(value, True, DARK_GRAY)
+            label_surf = text_cache.render(stat_font, label, GRAY)
+            value_surf = text_cache.render(value_font, value, DARK_GRAY)
             self.screen.blit(label_surf, (x, y))
             self.screen.blit(value_surf, (x, y + 24))
+    
+    def draw_race_statistics(self, standings):
+        """Draw the statistics panel as a race leaderboard, one column per algorithm"""
+        stats_x = self.maze_offset_x
+        stats_y = self.maze_offset_y + MAZE_VIEW_HEIGHT + 35
+        box_width = MAZE_VIEW_WIDTH
+        box_height = self.STATS_BOX_HEIGHT
+        
+        pygame.draw.rect(self.screen, (180, 180, 180),
+                        (stats_x + self.STATS_SHADOW_OFFSET, stats_y + self.STATS_SHADOW_OFFSET,
+                         box_width, box_height), border_radius=10)
+        pygame.draw.rect(self.screen, PANEL_BG, 
+                        (stats_x, stats_y, box_width, box_height), border_radius=10)
+        pygame.draw.rect(self.screen, BUTTON_SUCCESS, 
+                        (stats_x, stats_y, box_width, box_height), 3, border_radius=10)
+        
+        title = text_cache.render(fonts.get(26), "Race Results (nodes / path)", DARK_GRAY)
+        self.screen.blit(title, (stats_x + 30, stats_y + 18))
+        
+        stat_font = fonts.get(18)
+        value_font = fonts.get(22)
+        stat_spacing = (box_width - 40) // max(len(standings), 1)
+        y = stats_y + 43
+        for i, lane in enumerate(standings):
+            x = stats_x + 30 + i * stat_spacing
+            result = lane.result
+            place = f"#{lane.place}" if lane.place else "No path"
+            value = f"{result.nodes_expanded} / {result.path_length}"
+            self.screen.blit(text_cache.render(stat_font, f"{place} {lane.label}", GRAY), (x, y))
+            self.screen.blit(text_cache.render(value_font, value, DARK_GRAY), (x, y + 24))
 
 
 class MazeVisualizer:
     """Main application for the maze solver visualizer"""
     
-    def __init__(self):
+    # Dropdown option that races every algorithm instead of solving with one
+    RACE_OPTION = "Race All"
+    
+    def __init__(self, rows=MAZE_ROWS, cols=MAZE_COLS):
         pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Div's Algorithm Visualizer")
         self.clock = pygame.time.Clock()
         
         # Fonts - Modern sizing
-        self.font = pygame.font.Font(None, 26)
-        self.small_font = pygame.font.Font(None, 22)
-        self.title_font = pygame.font.Font(None, 44)
-        self.info_font = pygame.font.Font(None, 20)
-        self.button_font = pygame.font.Font(None, 24)  # Dedicated font for buttons
+        self.font = fonts.get(26)
+        self.small_font = fonts.get(22)
+        self.title_font = fonts.get(44)
+        self.info_font = fonts.get(20)
+        self.button_font = fonts.get(24)  # Dedicated font for buttons
         
         # Create maze
-        self.maze = Maze(MAZE_ROWS, MAZE_COLS)
+        self.maze = Maze(rows, cols)
         self.mode = "placing_start"
         
         # Calculate maze position - centered with more space
         self.maze_offset_x = 40
         self.maze_offset_y = 110
         
+        # The maze is shown through a zoomable, pannable viewport
+        self.camera = Camera((self.maze_offset_x, self.maze_offset_y, MAZE_VIEW_WIDTH, MAZE_VIEW_HEIGHT),
+                             rows, cols)
+        self.panning = False
+        
         # Create algorithms
         self.algorithms = {
             "BFS Algorithm": BFS(self.maze),
             "DFS Algorithm": DFS(self.maze),
             "A Star Algorithm": AStar(self.maze),
             "Dijkstra Algorithm": Dijkstra(self.maze),
-            
+            "Bidirectional BFS": BidirectionalBFS(self.maze),
+            "Bidirectional A*": BidirectionalAStar(self.maze),
+            "Tree Index": TreePath(self.maze),
+            "Junction A*": JunctionAStar(self.maze),
         }
         
+        # Instant routing to the end down its distance field, toggled with H
+        self.field_solver = DistanceFieldPath(self.maze)
+        self.show_field = False
+        
+        # Finished searches, replayed instead of solved again for the same query
+        self.solve_cache = SolveCache()
+        
         # Statistics
-        self.solve_time = 0
+        self.result = None
         self.nodes_visited = 0
         self.path_length = 0
         self.current_algorithm = None
@@ -232,7 +346,12 @@ class MazeVisualizer:
         
         # State
         self.running = True
-        self.solving = False
+        self.solve_task = None
+        self.trace_player = None
+        self.notice = None
+        self.skip_animation = False
+        self.needs_redraw = True
+        self.profiler = FrameProfiler(PROFILER_HISTORY)
         
         # Renderer
         self.renderer = UIRenderer(
@@ -243,7 +362,7 @@ class MazeVisualizer:
     def _init_ui(self):
         """Initialize all UI components with side layout"""
         # Buttons on the right side - moved lower
-        maze_width = MAZE_COLS * CELL_SIZE
+        maze_width = MAZE_VIEW_WIDTH
         button_x = self.maze_offset_x + maze_width + 40
         button_start_y = self.maze_offset_y + 400  # Moved down from 280 to 400
         button_width = 200
@@ -268,116 +387,480 @@ class MazeVisualizer:
         self.algorithm_label = Label(button_x, dropdown_y - 35, "Select Algorithm:", self.small_font, DARK_GRAY)
         self.algorithm_dropdown = Dropdown(
             button_x, dropdown_y, button_width, button_height,
-            ["BFS Algorithm", "DFS Algorithm", "A Star Algorithm", "Dijkstra Algorithm"],
+            ["BFS Algorithm", "DFS Algorithm", "A Star Algorithm", "Dijkstra Algorithm",
+             "Bidirectional BFS", "Bidirectional A*", "Tree Index", "Junction A*",
+             self.RACE_OPTION],
             self.font
         )
 
         # Status label with better positioning
         self.status_label = Label(40, 78, "", self.small_font, DARK_GRAY)
         
-    def handle_events(self):
+        # Animation controls share the status row, right-aligned to the maze
+        maze_right = self.maze_offset_x + maze_width
+        self.skip_button = Button(maze_right - 60, 75, 60, 24, "Skip", BUTTON_PRIMARY)
+        self.speed_slider = Slider(maze_right - 174, 87, 100, ANIMATION_SPEEDS,
+                                   DEFAULT_ANIMATION_SPEED)
+        self.speed_label = Label(maze_right - 341, 81, "", self.info_font, DARK_GRAY)
+        
+        # Replay timeline inside the statistics panel, right of its title
+        stats_y = self.maze_offset_y + MAZE_VIEW_HEIGHT + 35
+        self.timeline_slider = Slider(maze_right - 450, stats_y + 27, 330, range(1))
+        self.replay_button = Button(maze_right - 100, stats_y + 14, 80, 26, "Replay", BUTTON_PRIMARY)
+        
+    def handle_events(self, events=None):
         """Handle all pygame events"""
-        for event in pygame.event.get():
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                self._handle_click(pygame.mouse.get_pos())
+                self.notice = None
+                if event.button == 1:
+                    self._handle_click(pygame.mouse.get_pos())
+                elif event.button in (2, 3):
+                    # Middle or right drag pans the maze
+                    self.panning = self._view_target().view.collidepoint(event.pos)
+                self.needs_redraw = True
+            elif event.type == pygame.MOUSEBUTTONUP:
+                self.speed_slider.handle_release()
+                self.timeline_slider.handle_release()
+                if event.button in (2, 3):
+                    self.panning = False
+            elif event.type == pygame.MOUSEWHEEL:
+                pos = pygame.mouse.get_pos()
+                target = self._view_target()
+                if target.view.collidepoint(pos) and target.zoom(event.y, pos):
+                    self.needs_redraw = True
             elif event.type == pygame.MOUSEMOTION:
+                if self.panning and self._view_target().pan(*event.rel):
+                    self.needs_redraw = True
                 self._handle_hover(pygame.mouse.get_pos())
+            elif event.type == pygame.KEYDOWN:
+                self._handle_key(event.key)
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.needs_redraw = True
     
     def _handle_click(self, pos):
         """Handle mouse click events"""
+        # Animation controls stay live while a search is running
+        if self.speed_slider.handle_click(pos):
+            return
+        if self.skip_button.is_clicked(pos):
+            self.skip_animation = True
+            return
+        
+        # Replay controls for the last search
+        if self.trace_player and self.timeline_slider.handle_click(pos):
+            self._seek_trace(self.timeline_slider.selected)
+            return
+        if self.trace_player and self.replay_button.is_clicked(pos):
+            self._replay_trace()
+            return
+        
         # Handle dropdown first (it needs priority for expanded state)
         if self.algorithm_dropdown.handle_click(pos):
             return
         
+        # While solving, Solve acts as Pause/Resume and Clear Path as Cancel
         if self.generate_button.is_clicked(pos):
             self._generate_maze()
-        elif self.solve_button.is_clicked(pos) and not self.solving:
-            selected_algorithm = self.algorithm_dropdown.options[self.algorithm_dropdown.selected]
-            self._solve_maze(selected_algorithm)
+        elif self.solve_button.is_clicked(pos):
+            if self.solving:
+                self._toggle_pause()
+            else:
+                selected_algorithm = self.algorithm_dropdown.options[self.algorithm_dropdown.selected]
+                if selected_algorithm == self.RACE_OPTION:
+                    self._start_race()
+                else:
+                    self._solve_maze(selected_algorithm)
         elif self.reset_button.is_clicked(pos):
             self._reset_visualization()
         elif self.clear_button.is_clicked(pos):
             self._clear_path()
-        else:
+        elif not self.solving:
             self._handle_maze_click(pos)
     
     def _handle_hover(self, pos):
-        """Handle mouse hover events"""
-        self.algorithm_dropdown.update_hover(pos)
-        self.generate_button.update_hover(pos)
-        self.solve_button.update_hover(pos)
-        self.reset_button.update_hover(pos)
-        self.clear_button.update_hover(pos)
+        """Handle mouse hover events, redrawing only if a hover state changed"""
+        if self.trace_player and self.timeline_slider.handle_drag(pos):
+            self._seek_trace(self.timeline_slider.selected)
+        
+        changed = [
+            self.timeline_slider.update_hover(pos),
+            self.replay_button.update_hover(pos),
+            self.speed_slider.handle_drag(pos),
+            self.speed_slider.update_hover(pos),
+            self.skip_button.update_hover(pos),
+            self.algorithm_dropdown.update_hover(pos),
+            self.generate_button.update_hover(pos),
+            self.solve_button.update_hover(pos),
+            self.reset_button.update_hover(pos),
+            self.clear_button.update_hover(pos),
+        ]
+        if any(changed):
+            self.needs_redraw = True
+    
+    def _handle_key(self, key):
+        """Handle keyboard shortcuts
+        
+        +/- change animation speed, Enter skips to the result, Space pauses
+        or resumes and Escape cancels a running search. F fits the whole
+        maze in the view (the wheel zooms, right-drag pans; race panes move
+        together). With a recorded
+        search, Left/Right/Home/End scrub its replay, Space plays or pauses
+        it, Ctrl+S/Ctrl+O save or load it as TRACE_FILE, and Ctrl+E exports
+        its statistics to RESULTS_JSON_FILE and RESULTS_CSV_FILE. F3 toggles
+        the frame-time HUD and F9 profiles the next PROFILE_CAPTURE_FRAMES
+        frames. H shows the end's distance field as a heatmap and routes the
+        start down it, instantly wherever the start is placed.
+        """
+        if pygame.key.get_mods() & pygame.KMOD_CTRL:
+            if key == pygame.K_s:
+                self._save_trace()
+            elif key == pygame.K_o:
+                self._load_trace()
+            elif key == pygame.K_e:
+                self._export_result()
+            self.needs_redraw = True
+            return
+        
+        if key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.needs_redraw |= self.speed_slider.step(1)
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.needs_redraw |= self.speed_slider.step(-1)
+        elif key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            self.skip_animation = True
+        elif key == pygame.K_SPACE and self.solving:
+            self._toggle_pause()
+        elif key == pygame.K_ESCAPE and self.solving:
+            self._clear_path()
+        elif key == pygame.K_f:
+            self._view_target().fit()
+            self.needs_redraw = True
+        elif key == pygame.K_h and not self.solving:
+            self._toggle_distance_field()
+        elif key == pygame.K_F3:
+            self.profiler.enabled = not self.profiler.enabled
+            self.needs_redraw = True
+        elif key == pygame.K_F9:
+            self.profiler.start_capture(PROFILE_CAPTURE_FRAMES, PROFILE_FILE_PREFIX)
+            self.notice = f">> Profiling the next {PROFILE_CAPTURE_FRAMES} frames..."
+            self.needs_redraw = True
+        elif self.trace_player and not self.solving:
+            self._handle_replay_key(key)
+    
+    def _handle_replay_key(self, key):
+        """Keyboard control of the trace replay"""
+        player = self.trace_player
+        scrub = min(self._steps_per_frame(), len(player))
+        if key == pygame.K_SPACE:
+            if player.at_end:
+                self._replay_trace()
+            else:
+                player.playing = not player.playing
+        elif key == pygame.K_RIGHT:
+            self._seek_trace(player.position + scrub)
+        elif key == pygame.K_LEFT:
+            self._seek_trace(player.position - scrub)
+        elif key == pygame.K_HOME:
+            self._seek_trace(0)
+        elif key == pygame.K_END:
+            self._seek_trace(len(player))
+        self.needs_redraw = True
+    
+    @property
+    def race(self):
+        """The race being recorded or replayed, if any"""
+        return self.trace_player if isinstance(self.trace_player, Race) else None
+    
+    def _view_target(self):
+        """What the wheel, drag and F key move: the race panes, or else the camera"""
+        race = self.race
+        return race if race and race.ready else self.camera
+    
+    def _drop_trace(self):
+        """Forget the replayable search, stopping a race's workers if it has any"""
+        if self.race:
+            self.race.close()
+        self.trace_player = None
+    
+    @property
+    def solving(self):
+        """Whether a search is running (or paused)"""
+        return self.solve_task is not None
+    
+    def _steps_per_frame(self):
+        """Expanded nodes to apply per rendered frame at the current speed"""
+        if self.skip_animation:
+            return math.inf
+        speed = self.speed_slider.value
+        if speed is None:
+            # Auto: spread the worst case (every cell expanded) over the target length
+            return max(1, math.ceil(self.maze.size / (TARGET_ANIMATION_SECONDS * FPS)))
+        return speed
     
     def _generate_maze(self):
         """Generate a new maze"""
+        self.solve_task = None
+        self._drop_trace()
         self.maze.generate_maze()
         self.maze.start = None
         self.maze.end = None
         self.mode = "placing_start"
-        self.solving = False
     
     def _solve_maze(self, algorithm_name="BFS Algorithm"):
-        """Solve the maze using selected algorithm"""
+        """Start solving the maze using selected algorithm
+        
+        The search runs as a SolveTask that the main loop advances a slice
+        at a time, so the window stays responsive while it animates.
+        """
         if not self.maze.start or not self.maze.end:
             return
         
-        self.solving = True
         self.current_algorithm = algorithm_name
         algorithm = self.algorithms[algorithm_name]
         
-        start_time = time.time()
-        algorithm.solve(
-            self.screen, self.maze_offset_x, self.maze_offset_y,
-            CELL_SIZE, VISUALIZATION_DELAY
-        )
+        self.maze.clear_path()
+        self.skip_animation = False
+        self._drop_trace()
+        
+        cached = self.solve_cache.get(self.maze, algorithm.name, self.maze.start, self.maze.end,
+                                      with_trace=True)
+        if cached:
+            self.result, trace = cached
+            self._set_trace(trace, 0)
+            self._replay_trace()
+            return
+        
+        # Build any index the search reads before the first animated frame
+        algorithm.prepare()
+        trace = SearchTrace.for_maze(self.maze, algorithm=algorithm_name)
+        self.solve_task = SolveTask(self.maze, algorithm, trace=trace)
+        self.result = self.solve_task.result
+        self.nodes_visited = 0
+        self.path_length = 0
+        self.needs_redraw = True
+    
+    def _start_race(self):
+        """Race every algorithm on the maze, recording them in parallel worker processes
+        
+        The main loop polls the race until every search is recorded, then
+        replays them side by side like a single trace.
+        """
+        if not self.maze.start or not self.maze.end:
+            return
+        
+        self.solve_task = None
+        self._drop_trace()
+        self.maze.clear_path()
+        self.current_algorithm = self.RACE_OPTION
+        self.result = None
+        self.nodes_visited = 0
+        self.path_length = 0
+        self.skip_animation = False
+        self.trace_player = Race(self.maze, list(self.algorithms.items()), self.camera.view)
+        self.timeline_slider.values = range(1)
+        self.needs_redraw = True
+    
+    def _toggle_pause(self):
+        """Pause or resume the running search"""
+        self.solve_task.paused = not self.solve_task.paused
+        self.needs_redraw = True
+    
+    def _step_solve_task(self):
+        """Advance the running search by one frame's worth of work and show it"""
+        task = self.solve_task
+        task.advance(self._steps_per_frame(), SOLVE_FRAME_BUDGET_MS / 1000)
+        self.profiler.lap("solver")
+        
+        self.nodes_visited = task.nodes_visited
+        self.path_length = task.path_length
+        if task.finished:
+            self.solve_task = None
+            task.trace.result = task.result
+            self._set_trace(task.trace)
+            self.solve_cache.put(self.maze, task.result.algorithm, self.maze.start, self.maze.end,
+                                 task.result, task.trace)
+            self.needs_redraw = True
+        
+        # Drawing the search counts as render time, kept apart from compute
+        started = time.perf_counter_ns()
+        self._draw_frame()
+        task.result.render_ns += time.perf_counter_ns() - started
+    
+    def _set_trace(self, trace, position=None):
+        """Make a trace the replayable one, with the playhead at its end or at position"""
+        position = len(trace) if position is None else position
+        self.trace_player = TracePlayer(self.maze, trace, position)
+        self.timeline_slider.values = range(len(trace) + 1)
+        self.timeline_slider.select(position)
+    
+    def _replay_trace(self):
+        """Play the recorded search from the start (or resume it)"""
+        if self.trace_player.at_end:
+            self._seek_trace(0)
+        self.skip_animation = False
+        self.trace_player.playing = True
+        self.needs_redraw = True
+    
+    def _seek_trace(self, position):
+        """Move the replay playhead, stopping playback"""
+        self.trace_player.playing = False
+        self.trace_player.seek(position)
+        self._sync_trace_statistics()
+    
+    def _step_replay(self):
+        """Advance the replay by one frame's worth of steps and show it"""
+        race = self.race
+        if race and not race.ready:
+            # Wait for the workers, then show the panes from the start
+            if race.poll():
+                self.timeline_slider.values = range(len(race) + 1)
+                self.needs_redraw = True
+        else:
+            self.trace_player.advance(self._steps_per_frame())
+        self._sync_trace_statistics()
+        self.profiler.lap("solver")
+        if not self.trace_player.playing:
+            self.needs_redraw = True
+        self._draw_frame()
+    
+    def _sync_trace_statistics(self):
+        """Show the counters and timeline position of the replay playhead"""
+        player = self.trace_player
+        self.nodes_visited = player.nodes_visited
+        self.path_length = player.path_length
+        self.timeline_slider.select(player.position)
+    
+    def _save_trace(self):
+        """Save the last recorded search to TRACE_FILE"""
+        if not self.trace_player:
+            self.notice = ">> Nothing to save yet - solve the maze first"
+            return
+        if self.race:
+            self.notice = ">> Races are not saved - solve with one algorithm to save it"
+            return
+        try:
+            self.trace_player.trace.save(TRACE_FILE)
+        except OSError as error:
+            self.notice = f">> Could not save trace: {error.strerror}"
+        else:
+            self.notice = f">> Saved search trace to {TRACE_FILE}"
+    
+    def _load_trace(self):
+        """Load TRACE_FILE, restoring its maze and showing the final result"""
+        try:
+            trace = SearchTrace.load(TRACE_FILE)
+        except OSError as error:
+            self.notice = f">> Could not load trace: {error.strerror}"
+            return
+        except ValueError:
+            self.notice = f">> {TRACE_FILE} is not a valid search trace"
+            return
+        if (trace.rows, trace.cols) != (self.maze.rows, self.maze.cols):
+            self.notice = f">> Trace is for a {trace.rows}x{trace.cols} maze"
+            return
         
-        self.solve_time = time.time() - start_time
-        self.nodes_visited = sum(1 for row in self.maze.grid for cell in row if cell.is_visited_search)
-        self.path_length = sum(1 for row in self.maze.grid for cell in row if cell.is_path)
-        self.solving = False
+        self.solve_task = None
+        self._drop_trace()
+        self.maze.restore_walls(trace.walls)
+        self.maze.start = trace.start
+        self.maze.end = trace.end
+        self.mode = "ready" if trace.start and trace.end else "placing_start"
+        self.current_algorithm = trace.algorithm or None
+        self.result = trace.result
+        self._set_trace(trace)
+        self._sync_trace_statistics()
+        self.notice = f">> Loaded search trace from {TRACE_FILE}"
+    
+    def _export_result(self):
+        """Write the last search's (or race's) statistics as JSON and append them to the CSV log"""
+        race = self.race
+        if race and race.ready:
+            results = [lane.result for lane in race.standings()]
+        elif self.result and not self.solve_task:
+            results = [self.result]
+        else:
+            self.notice = ">> Nothing to export yet - solve the maze first"
+            return
+        try:
+            write_json(results, RESULTS_JSON_FILE)
+            append_csv(results, RESULTS_CSV_FILE)
+        except OSError as error:
+            self.notice = f">> Could not export results: {error.strerror}"
+        else:
+            self.notice = f">> Exported results to {RESULTS_JSON_FILE} and {RESULTS_CSV_FILE}"
+    
+    def _draw_frame(self):
+        """Draw a frame of a running animation: everything if needed, else only changes"""
+        if self.needs_redraw:
+            self.draw()
+            self.needs_redraw = False
+        else:
+            self._draw_search_frame()
+    
+    def _draw_search_frame(self):
+        """Update only the maze cells and panels that changed since the last frame"""
+        race = self.race
+        if race and race.ready:
+            rects = race.draw_dirty(self.screen)
+        else:
+            origin_x, origin_y = self.camera.origin
+            rects = self.maze.draw_dirty(self.screen, origin_x, origin_y, self.camera.cell_size, self.camera.view)
+        self.profiler.lap("maze")
+        
+        # Live statistics
+        stats_rect = self.renderer.statistics_rect()
+        self.renderer.restore_background(stats_rect)
+        self._draw_statistics()
+        rects.append(stats_rect)
+        if self.profiler.enabled:
+            rects.append(self.renderer.draw_profiler_hud(self._hud_lines()))
+        self.profiler.lap("ui")
+        
+        pygame.display.update(rects)
+        self.profiler.lap("flip")
     
     def _clear_path(self):
         """Clear only the pathfinding visualization, keep maze structure"""
+        self.solve_task = None
+        self._drop_trace()
         self.maze.clear_path()
-        self.solve_time = 0
+        self.result = None
         self.nodes_visited = 0
         self.path_length = 0
         self.current_algorithm = None
-        self.solving = False
     
     def _reset_visualization(self):
         """Reset everything including maze structure"""
+        self.solve_task = None
+        self._drop_trace()
         self.maze.clear_path()
         self.maze.start = None
         self.maze.end = None
         self.mode = "placing_start"
-        self.solve_time = 0
+        self.result = None
         self.nodes_visited = 0
         self.path_length = 0
-        self.solving = False
     
     def _handle_maze_click(self, pos):
         """Handle clicks on the maze grid"""
-        mx, my = pos
-        
-        # Check if click is within maze bounds
-        maze_right = self.maze_offset_x + MAZE_COLS * CELL_SIZE
-        maze_bottom = self.maze_offset_y + MAZE_ROWS * CELL_SIZE
-        
-        if not (self.maze_offset_x <= mx < maze_right and self.maze_offset_y <= my < maze_bottom):
+        # Map the click through the camera (or a race pane); ignore it outside the maze
+        race = self.race
+        cell = (race if race and race.ready else self.camera).screen_to_cell(pos)
+        if cell is None:
             return
+        row, col = cell
         
-        # Calculate cell coordinates
-        col = (mx - self.maze_offset_x) // CELL_SIZE
-        row = (my - self.maze_offset_y) // CELL_SIZE
+        # The recorded search no longer matches the markers once they move
+        self._drop_trace()
         
         # Place start or end point based on mode
         if self.mode == "placing_start":
             self.maze.start = (row, col)
-            self.mode = "placing_end"
+            self.mode = "ready" if self.maze.end else "placing_end"
         elif self.mode == "placing_end":
             if (row, col) != self.maze.start:
                 self.maze.end = (row, col)
@@ -390,9 +873,64 @@ class MazeVisualizer:
             elif self.maze.end and (row, col) == self.maze.end:
                 self.maze.end = None
                 self.mode = "placing_end"
+        
+        if self.show_field:
+            self._route_through_field()
+    
+    def _toggle_distance_field(self):
+        """Show or hide the end's distance field heatmap, routing the start down it"""
+        self.show_field = not self.show_field
+        if self.show_field:
+            self._route_through_field()
+        self.needs_redraw = True
+    
+    def _route_through_field(self):
+        """Show the start's path down the end's distance field instead of searching
+        
+        The field is built by the first route to an end and cached on the
+        maze, so moving the start around afterwards only walks its path.
+        """
+        self._clear_path()
+        if not (self.maze.start and self.maze.end):
+            return
+        self.result = self.field_solver.solve()
+        for row, col in self.result.path or ():
+            self.maze.set_flag(row, col, FLAG_PATH)
+        self.path_length = self.result.path_length
+        self.current_algorithm = "Distance Field"
+    
+    def _visible_field(self):
+        """The distance field to draw over the maze, if any
+        
+        It gives way to a running or recorded search, whose incremental
+        redraws would paint over it.
+        """
+        if not (self.show_field and self.maze.end) or self.solve_task or self.trace_player:
+            return None
+        return self.maze.distance_field(self.maze.index(*self.maze.end))
     
     def _update_status_message(self):
         """Update the status message based on current mode"""
+        if self.notice:
+            self.status_label.update_text(self.notice)
+            return
+        if self.race and not self.race.ready:
+            self.status_label.update_text(">> Racing... recording every algorithm in parallel")
+            return
+        if self.trace_player and self.trace_player.playing:
+            self.status_label.update_text(">> Replaying... Space pauses, arrows scrub, Enter skips")
+            return
+        if self.solve_task and self.solve_task.paused:
+            self.status_label.update_text(">> Paused - press Space or Resume to continue")
+            return
+        if self.solve_task:
+            self.status_label.update_text(">> Solving... Space pauses, Esc cancels, Enter skips")
+            return
+        
+        if self.mode == "ready" and self._visible_field():
+            self.status_label.update_text(">> Distance field: move the start for an instant route, H hides it")
+            return
+        
         messages = {
             "placing_start": ">> Click on the maze to place the START point (Green circle)",
             "placing_end": ">> Click on the maze to place the END point (Red circle)",
@@ -402,22 +940,40 @@ class MazeVisualizer:
     
     def draw(self):
         """Draw all elements on screen with modern styling"""
-        self.screen.fill(BACKGROUND)
-        
-        # Draw title panel
-        self.renderer.draw_title()
+        # Draw the cached title, maze border and legend panels
+        self.renderer.draw_background()
         
         # Update and draw status
         self._update_status_message()
         self.status_label.draw(self.screen)
+        self.profiler.lap("ui")
         
-        # Draw maze with border
-        self.renderer.draw_maze_border()
-        self.maze.draw(self.screen, self.maze_offset_x, self.maze_offset_y, CELL_SIZE)
+        # Draw maze, or the race panes
+        race = self.race
+        if race and race.ready:
+            race.draw(self.screen)
+        else:
+            origin_x, origin_y = self.camera.origin
+            self.maze.draw(self.screen, origin_x, origin_y, self.camera.cell_size, self.camera.view)
+            field = self._visible_field()
+            if field:
+                self.maze.draw_heatmap(self.screen, field, origin_x, origin_y,
+                                       self.camera.cell_size, self.camera.view)
+        self.profiler.lap("maze")
         
-        # Draw legend and statistics
-        self.renderer.draw_legend()
-        self.renderer.draw_statistics(self.solve_time, self.nodes_visited, self.path_length, self.current_algorithm)
+        # Draw statistics
+        self._draw_statistics()
+        
+        # Draw animation controls in the status row
+        self._draw_animation_controls()
+        
+        # While solving, Solve becomes Pause/Resume and Clear Path becomes Cancel
+        if self.solve_task:
+            self.solve_button.text = "Resume" if self.solve_task.paused else "Pause"
+            self.clear_button.text = "Cancel"
+        else:
+            self.solve_button.text = "Solve"
+            self.clear_button.text = "Clear Path"
         
         # Draw control buttons with button font
         self.generate_button.draw(self.screen, self.button_font)
@@ -432,16 +988,98 @@ class MazeVisualizer:
         # Draw expanded dropdown options on top of everything
         self.algorithm_dropdown.draw_expanded_options(self.screen)
         
+        if self.profiler.enabled:
+            self.renderer.draw_profiler_hud(self._hud_lines())
+        self.profiler.lap("ui")
+        
         pygame.display.flip()
+        self.profiler.lap("flip")
+    
+    def _draw_statistics(self):
+        """Draw the statistics panel, with the replay timeline once a search is recorded"""
+        race = self.race
+        if race:
+            if race.ready:
+                self.renderer.draw_race_statistics(race.standings())
+                self.timeline_slider.draw(self.screen)
+                self.replay_button.draw(self.screen, fonts.get(20))
+            return
+        self.renderer.draw_statistics(self.result, self.nodes_visited, self.path_length, self.current_algorithm)
+        if self.trace_player and self.result:
+            self.timeline_slider.draw(self.screen)
+            self.replay_button.draw(self.screen, fonts.get(20))
+    
+    def _draw_animation_controls(self):
+        """Draw the speed slider, its label and the skip button"""
+        speed = self.speed_slider.value
+        if speed is None:
+            self.speed_label.update_text(f"Speed: auto ({TARGET_ANIMATION_SECONDS}s)")
+        else:
+            self.speed_label.update_text(f"Speed: {speed} steps/frame" if speed > 1 else "Speed: 1 step/frame")
+        self.speed_label.draw(self.screen)
+        self.speed_slider.draw(self.screen)
+        self.skip_button.draw(self.screen, fonts.get(20))
+    
+    def _hud_lines(self):
+        """Text of the F3 HUD: the frame profile and the solve cache statistics"""
+        return self.profiler.summary_lines() + [self.solve_cache.summary()]
+    
+    def _end_frame(self):
+        """Close the profiler frame, reporting a profile capture once it is written"""
+        capture = self.profiler.capture
+        self.profiler.end_frame()
+        if capture and self.profiler.capture is None:
+            if capture.error:
+                self.notice = f">> Could not write profile: {capture.error.strerror}"
+            else:
+                self.notice = f">> Profile written to {capture.report_file}"
+            self.needs_redraw = True
+    
+    def _animating(self):
+        """Whether a search or a replay should advance this frame"""
+        if self.solve_task:
+            return not self.solve_task.paused
+        return bool(self.trace_player and self.trace_player.playing)
+    
+    def _is_dirty(self):
+        """Check whether anything on screen changed since the last frame"""
+        return self.needs_redraw or self.maze.full_redraw or bool(self.maze.dirty)
     
     def run(self):
-        """Main game loop"""
+        """Main loop: advance a running search, or sleep on events until something changes"""
         self.maze.generate_maze()
         
+        # Every section ends with a profiler lap charging its time to a
+        # phase; a frame closes once something was drawn
+        profiler = self.profiler
         while self.running:
-            self.handle_events()
-            self.draw()
-            self.clock.tick(60)
+            if self._animating():
+                self.handle_events()
+                profiler.lap("events")
+                if self.solve_task and not self.solve_task.paused:
+                    self._step_solve_task()
+                elif self.trace_player and self.trace_player.playing:
+                    self._step_replay()
+                self._end_frame()
+                self.clock.tick(FPS)
+                profiler.lap(profiler.WAIT)
+                continue
+            
+            if self._is_dirty():
+                self.draw()
+                self.needs_redraw = False
+                self._end_frame()
+                self.clock.tick(FPS)
+                profiler.lap(profiler.WAIT)
+                events = pygame.event.get()
+            else:
+                # Nothing to repaint: block until input arrives
+                event = pygame.event.wait(IDLE_WAIT_MS)
+                profiler.lap(profiler.WAIT)
+                events = [event] + pygame.event.get()
+            self.handle_events(events)
+            profiler.lap("events")
         
+        self._drop_trace()
         pygame.quit()
         sys.exit()
\ No newline at end of file